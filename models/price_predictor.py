@@ -11,6 +11,58 @@ import json
 from pathlib import Path
 
 
+class _PriceRing:
+    """
+    Fixed-capacity float64 ring buffer of recent prices.
+
+    One unboxed array plus a write index per market instead of a Python
+    list of boxed floats - the windowed statistics in the predictors
+    then run directly over the array view.
+    """
+    __slots__ = ('buf', 'idx')
+
+    def __init__(self, capacity: int = 50):
+        self.buf = np.empty(capacity, dtype=np.float64)
+        self.idx = 0
+
+    def __len__(self) -> int:
+        return min(self.idx, self.buf.shape[0])
+
+    def append(self, price: float):
+        self.buf[self.idx % self.buf.shape[0]] = price
+        self.idx += 1
+
+    def extend(self, prices):
+        """Write a whole batch with at most two slice assignments"""
+        arr = np.asarray(prices, dtype=np.float64)
+        n = arr.shape[0]
+        cap = self.buf.shape[0]
+        if n >= cap:
+            # Only the last `cap` samples survive anyway
+            self.buf[:] = arr[-cap:]
+            self.idx = cap
+            return
+        start = self.idx % cap
+        end = start + n
+        if end <= cap:
+            self.buf[start:end] = arr
+        else:
+            split = cap - start
+            self.buf[start:] = arr[:split]
+            self.buf[:end - cap] = arr[split:]
+        self.idx += n
+
+    def view(self) -> np.ndarray:
+        """Prices in chronological order, oldest first"""
+        cap = self.buf.shape[0]
+        if self.idx <= cap:
+            return self.buf[:self.idx]
+        cut = self.idx % cap
+        if cut == 0:
+            return self.buf
+        return np.concatenate((self.buf[cut:], self.buf[:cut]))
+
+
 @dataclass
 class PricePrediction:
     """Result from price prediction model"""
@@ -62,7 +114,25 @@ class SimplePricePredictor:
         # Keep only recent history
         if len(self.price_memory[market_slug]) > self.memory_size:
             self.price_memory[market_slug] = self.price_memory[market_slug][-self.memory_size:]
-    
+
+    def update_many(self, market_slug: str, prices: List[float],
+                    timestamp: Optional[datetime] = None):
+        """
+        Add a batch of price observations in one call.
+
+        One timestamp and one list extend for the whole batch instead
+        of a Python frame plus trim per sample.
+        """
+        if timestamp is None:
+            timestamp = datetime.now()
+        ts = timestamp.isoformat()
+
+        history = self.price_memory.setdefault(market_slug, [])
+        history.extend({'price': float(p), 'timestamp': ts} for p in prices)
+
+        if len(history) > self.memory_size:
+            self.price_memory[market_slug] = history[-self.memory_size:]
+
     def predict(self, market_slug: str) -> PricePrediction:
         """
         Predict next price using momentum + mean reversion heuristics.
@@ -224,30 +294,38 @@ class MomentumPredictor:
     def __init__(self, short_window: int = 3, long_window: int = 10):
         self.short_window = short_window
         self.long_window = long_window
-        self.price_memory: Dict[str, List[float]] = {}
-    
+        # Ring buffer per market - capacity matches the old 50-sample trim
+        self.price_memory: Dict[str, _PriceRing] = {}
+
     def update(self, market_slug: str, price: float):
         """Add price observation"""
-        if market_slug not in self.price_memory:
-            self.price_memory[market_slug] = []
-        self.price_memory[market_slug].append(price)
-        # Keep limited history
-        self.price_memory[market_slug] = self.price_memory[market_slug][-50:]
-    
+        ring = self.price_memory.get(market_slug)
+        if ring is None:
+            ring = self.price_memory[market_slug] = _PriceRing()
+        ring.append(price)
+
+    def update_many(self, market_slug: str, prices: List[float]):
+        """Add a batch of price observations in one slice write"""
+        ring = self.price_memory.get(market_slug)
+        if ring is None:
+            ring = self.price_memory[market_slug] = _PriceRing()
+        ring.extend(prices)
+
     def predict(self, market_slug: str) -> PricePrediction:
         """Generate momentum signal"""
-        prices = self.price_memory.get(market_slug, [])
-        
-        if len(prices) < self.long_window:
+        ring = self.price_memory.get(market_slug)
+        prices = ring.view() if ring is not None else np.empty(0)
+
+        if prices.shape[0] < self.long_window:
             return PricePrediction(
                 market_slug=market_slug,
-                predicted_price=prices[-1] if prices else 0.5,
+                predicted_price=float(prices[-1]) if prices.shape[0] else 0.5,
                 confidence=0.2,
                 trend_direction='NEUTRAL',
                 features_used=['insufficient_data'],
                 model_name='MomentumPredictor'
             )
-        
+
         short_ma = np.mean(prices[-self.short_window:])
         long_ma = np.mean(prices[-self.long_window:])
         
@@ -282,31 +360,40 @@ class MeanReversionPredictor:
     def __init__(self, window: int = 20, mean: float = 0.5):
         self.window = window
         self.mean = mean
-        self.price_memory: Dict[str, List[float]] = {}
-    
+        # Ring buffer per market - capacity matches the old 50-sample trim
+        self.price_memory: Dict[str, _PriceRing] = {}
+
     def update(self, market_slug: str, price: float):
         """Add price observation"""
-        if market_slug not in self.price_memory:
-            self.price_memory[market_slug] = []
-        self.price_memory[market_slug].append(price)
-        self.price_memory[market_slug] = self.price_memory[market_slug][-50:]
-    
+        ring = self.price_memory.get(market_slug)
+        if ring is None:
+            ring = self.price_memory[market_slug] = _PriceRing()
+        ring.append(price)
+
+    def update_many(self, market_slug: str, prices: List[float]):
+        """Add a batch of price observations in one slice write"""
+        ring = self.price_memory.get(market_slug)
+        if ring is None:
+            ring = self.price_memory[market_slug] = _PriceRing()
+        ring.extend(prices)
+
     def predict(self, market_slug: str) -> PricePrediction:
         """Generate mean reversion signal"""
-        prices = self.price_memory.get(market_slug, [])
-        
-        if len(prices) < 5:
+        ring = self.price_memory.get(market_slug)
+        prices = ring.view() if ring is not None else np.empty(0)
+
+        if prices.shape[0] < 5:
             return PricePrediction(
                 market_slug=market_slug,
-                predicted_price=prices[-1] if prices else 0.5,
+                predicted_price=float(prices[-1]) if prices.shape[0] else 0.5,
                 confidence=0.2,
                 trend_direction='NEUTRAL',
                 features_used=['insufficient_data'],
                 model_name='MeanReversionPredictor'
             )
-        
+
         current = prices[-1]
-        ma = np.mean(prices[-self.window:]) if len(prices) >= self.window else np.mean(prices)
+        ma = np.mean(prices[-self.window:]) if prices.shape[0] >= self.window else np.mean(prices)
         
         # Distance from mean
         distance = current - self.mean
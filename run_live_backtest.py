@@ -6,74 +6,95 @@ Timestamp: 2026-02-03 17:53 GMT+1
 
 import json
 import sys
+import numpy as np
+import pandas as pd
 from datetime import datetime
 from utils.backtest import BacktestEngine
 
+LOW_MEM = '--low-mem' in sys.argv
+
+
+def load_dataframe(path, low_mem=False, chunk_size=100_000):
+    """
+    Load the resolved-markets JSON into a DataFrame.
+
+    With low_mem=True, stream records via ijson and build the DataFrame
+    in chunks - peak memory is one chunk of dicts plus the columnar
+    frame, instead of the whole file as Python objects.
+    """
+    if low_mem:
+        try:
+            import ijson
+        except ImportError:
+            print("⚠️  --low-mem requested but ijson isn't installed; using json.load")
+        else:
+            chunks = []
+            buf = []
+            with open(path, 'rb') as f:
+                for rec in ijson.items(f, 'item', use_float=True):
+                    buf.append(rec)
+                    if len(buf) >= chunk_size:
+                        chunks.append(pd.DataFrame(buf))
+                        buf = []
+            if buf:
+                chunks.append(pd.DataFrame(buf))
+            return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+    with open(path, 'r') as f:
+        return pd.DataFrame(json.load(f))
+
+
 print('=' * 70)
 print('🔄 LOADING HISTORICAL DATA FOR BACKTEST')
 print('=' * 70)
 
 # Load the data
 print('\nLoading resolved_markets.json (110 MB)...')
-with open('data/resolved_markets.json', 'r') as f:
-    data = json.load(f)
+df = load_dataframe('data/resolved_markets.json', low_mem=LOW_MEM)
 
-print(f'Loaded {len(data):,} records')
+print(f'Loaded {len(df):,} records')
 
-# Group by market - we need price history for each market
+# Single columnar pass instead of group-dicts + per-record dict rebuilds:
+# sort once, mark each market's final row, then hand the records straight
+# to the backtest (same .to_dict('records') shape load_from_parquet uses)
 print('\nGrouping by market...')
-markets = {}
-for record in data:
-    slug = record['market_slug']
-    if slug not in markets:
-        markets[slug] = []
-    markets[slug].append(record)
+if 'category' not in df.columns:
+    df['category'] = 'general'
+df['category'] = df['category'].fillna('general')
 
-print(f'Found {len(markets)} unique markets')
+print(f'Found {df["market_slug"].nunique()} unique markets')
 
-# Filter to markets with outcomes
-resolved_slugs = []
-for slug, records in markets.items():
-    has_outcome = any(r.get('outcome') is not None for r in records)
-    if has_outcome:
-        resolved_slugs.append(slug)
+# Last non-null outcome per market (in first-appearance order)
+appearance_order = df['market_slug'].drop_duplicates()
+resolved_outcomes = (
+    df.dropna(subset=['outcome'])
+    .groupby('market_slug', sort=False)['outcome']
+    .last()
+)
 
-print(f'Resolved markets: {len(resolved_slugs)}')
+print(f'Resolved markets: {len(resolved_outcomes)}')
 
 # Sample: take first 20 resolved markets for testing
-sample_slugs = resolved_slugs[:20]
+sample_slugs = [s for s in appearance_order if s in resolved_outcomes.index][:20]
 print(f'Using sample of {len(sample_slugs)} markets for backtest')
 
 # Prepare data in format BacktestEngine expects
-historical_data = []
-for slug in sample_slugs:
-    records = sorted(markets[slug], key=lambda x: x['timestamp'])
-    outcome = None
-    for r in reversed(records):
-        if r.get('outcome') is not None:
-            outcome = r['outcome']
-            break
-    
-    if outcome is not None:
-        for r in records[:-1]:
-            if r.get('price') is not None:
-                historical_data.append({
-                    'timestamp': r['timestamp'],
-                    'market_slug': slug,
-                    'question': r['question'],
-                    'price': r['price'],
-                    'outcome': None,
-                    'category': r.get('category', 'general')
-                })
-        final = records[-1]
-        historical_data.append({
-            'timestamp': final['timestamp'],
-            'market_slug': slug,
-            'question': final['question'],
-            'price': final.get('price', 0.5),
-            'outcome': outcome,
-            'category': final.get('category', 'general')
-        })
+sub = df[df['market_slug'].isin(sample_slugs)]
+sub = sub.sort_values(['market_slug', 'timestamp'], kind='mergesort')
+
+# Drop null-price rows, but keep each market's final (outcome-bearing) row
+is_final = ~sub.duplicated('market_slug', keep='last')
+sub = sub[is_final | sub['price'].notna()]
+is_final = ~sub.duplicated('market_slug', keep='last')
+
+sub = sub.assign(
+    outcome=np.where(is_final, sub['market_slug'].map(resolved_outcomes), None),
+    price=sub['price'].where(sub['price'].notna(), 0.5)
+)
+
+historical_data = sub[
+    ['timestamp', 'market_slug', 'question', 'price', 'outcome', 'category']
+].to_dict('records')
 
 print(f'Prepared {len(historical_data)} observations for backtest')
 
@@ -15,6 +15,7 @@ import sys
 import os
 import time
 import signal
+import fcntl
 import psutil
 from pathlib import Path
 from datetime import datetime
@@ -29,43 +30,77 @@ LOG_FILE = Path('logs/paper_trading_continuous.log')
 CHECK_INTERVAL = 300  # 5 minutes
 
 
-def is_already_running():
-    """Check if another instance is already running"""
-    if PID_FILE.exists():
-        try:
-            with open(PID_FILE, 'r') as f:
-                pid = int(f.read().strip())
-            
-            # Check if process exists
-            if psutil.pid_exists(pid):
-                process = psutil.Process(pid)
-                if 'paper_trading' in process.name() or any('paper_trading' in arg for arg in process.cmdline()):
-                    return True
-        except (ValueError, psutil.NoSuchProcess):
-            pass
-        
-        # Stale PID file
-        PID_FILE.unlink()
-    return False
+# File descriptor holding the advisory lock for this process's lifetime.
+# The kernel releases the lock automatically on exit (even on SIGKILL),
+# so there's no stale-lock cleanup to do.
+_lock_fd = None
 
 
-def write_pid():
-    """Write current PID to file"""
+def acquire_lock():
+    """
+    Take an exclusive advisory lock on the PID file.
+    Returns True if acquired (we're the only instance), False otherwise.
+    """
+    global _lock_fd
     PID_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(PID_FILE, 'w') as f:
-        f.write(str(os.getpid()))
+    fd = os.open(PID_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return False
+
+    # We hold the lock - record our PID for status/stop commands
+    os.ftruncate(fd, 0)
+    os.write(fd, str(os.getpid()).encode())
+    _lock_fd = fd
+    return True
+
+
+def is_already_running():
+    """Check if another instance holds the PID-file lock"""
+    if not PID_FILE.exists():
+        return False
+
+    try:
+        fd = os.open(PID_FILE, os.O_RDWR)
+    except OSError:
+        return False
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        # Lock held by the running monitor
+        return True
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return False
+    finally:
+        os.close(fd)
 
 
 def remove_pid():
-    """Remove PID file on exit"""
+    """Release the lock and remove the PID file on exit"""
+    global _lock_fd
+    if _lock_fd is not None:
+        os.close(_lock_fd)
+        _lock_fd = None
     if PID_FILE.exists():
         PID_FILE.unlink()
 
 
+# Cached (epoch second, formatted string) so rapid log bursts within the
+# same second skip the relatively expensive strftime call
+_last_log_ts = [0, '']
+
+
 def log_message(message):
     """Log to file with timestamp"""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    log_line = f"[{timestamp}] {message}\n"
+    now = int(time.time())
+    if now != _last_log_ts[0]:
+        _last_log_ts[0] = now
+        _last_log_ts[1] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+    log_line = f"[{_last_log_ts[1]}] {message}\n"
     
     LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
     with open(LOG_FILE, 'a') as f:
@@ -84,16 +119,13 @@ def signal_handler(signum, frame):
 
 def run_continuous():
     """Main continuous loop"""
-    # Check if already running
-    if is_already_running():
+    # Take the instance lock (also writes our PID)
+    if not acquire_lock():
         print("❌ Paper trading monitor is already running!")
         print(f"   PID file: {PID_FILE}")
         print("   Use 'python3 run_paper_trading_continuous.py status' to check")
         sys.exit(1)
-    
-    # Write PID file
-    write_pid()
-    
+
     # Setup signal handlers
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
@@ -192,26 +224,31 @@ def check_status():
     running = False
     
     if not PID_FILE.exists():
-        # Double check with ps
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+        # Double check with a raw /proc scan - cmdline is one NUL-separated
+        # buffer, so a single bytes search beats decoding args via psutil
+        own_pid = os.getpid()
+        for pid in psutil.pids():
+            if pid == own_pid:
+                continue
             try:
-                cmdline = ' '.join(proc.info['cmdline'] or [])
-                if 'run_paper_trading_continuous' in cmdline and proc.info['pid'] != os.getpid():
-                    print(f"✅ Monitor is running (PID: {proc.info['pid']})")
-                    print(f"   Found via process scan (no PID file)")
-                    running = True
-                    return running
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        
+                with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                    buf = f.read()
+            except OSError:
+                continue
+            if b'run_paper_trading_continuous' in buf:
+                print(f"✅ Monitor is running (PID: {pid})")
+                print(f"   Found via process scan (no PID file)")
+                running = True
+                return running
+
         print("❌ Monitor is NOT running")
         return running
     
     try:
         with open(PID_FILE, 'r') as f:
             pid = int(f.read().strip())
-        
-        if psutil.pid_exists(pid):
+
+        if is_already_running():
             process = psutil.Process(pid)
             print(f"✅ Monitor is RUNNING (PID: {pid})")
             print(f"   Started: {datetime.fromtimestamp(process.create_time()).strftime('%Y-%m-%d %H:%M:%S')}")
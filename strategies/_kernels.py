@@ -0,0 +1,81 @@
+"""
+JIT-compiled numeric kernels for the strategy hot path.
+
+Small scalar/vector functions called hundreds of times per scan cycle
+(Sharpe from rolling moments, softmax weighting, raw Kelly fraction).
+With numba installed they compile to machine code via utils.jit; without
+it the same NumPy/scalar math runs interpreted.
+"""
+
+import numpy as np
+
+from utils.jit import HAS_NUMBA, njit
+
+
+@njit(cache=True)
+def sharpe(sum_: float, sumsq: float, n: float) -> float:
+    """Sharpe ratio from rolling sum/sum-of-squares over n returns."""
+    mean = sum_ / n
+    var = sumsq / n - mean * mean
+    if var < 0.0:
+        var = 0.0
+    std = np.sqrt(var)
+    if std == 0.0:
+        return 1.0 if mean > 0.0 else 0.0
+    return mean / std
+
+
+@njit(cache=True)
+def softmax_pos(arr: np.ndarray) -> np.ndarray:
+    """Softmax over max(0, arr), max-subtracted for numerical stability."""
+    x = np.maximum(arr, 0.0)
+    x = x - x.max()
+    w = np.exp(x)
+    return w / w.sum()
+
+
+@njit(cache=True)
+def kelly_fraction(p: float, price: float) -> float:
+    """
+    Raw Kelly fraction f* = (bp - q) / b for win probability p at entry
+    price. Returns 0.0 when there is no positive expected value.
+    """
+    if price <= 0.0:
+        return 0.0
+    b = (1.0 - price) / price
+    if b <= 0.0:
+        return 0.0
+    numerator = b * p - (1.0 - p)
+    if numerator <= 0.0:
+        return 0.0
+    return numerator / b
+
+
+@njit(cache=True)
+def time_multiplier(days: float) -> float:
+    """Strategy B priority multiplier ladder by days to resolution."""
+    if days < 7.0:
+        return 3.0
+    elif days < 30.0:
+        return 2.0
+    elif days < 90.0:
+        return 1.25
+    return 0.5
+
+
+@njit(cache=True)
+def score_batch(days: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Priority scores abs(edge) * time_multiplier for signal batches."""
+    out = np.empty(days.size, dtype=np.float64)
+    for i in range(days.size):
+        out[i] = abs(edges[i]) * time_multiplier(days[i])
+    return out
+
+
+if HAS_NUMBA:
+    # Warm the JIT at import so the one-time compile cost isn't paid
+    # mid-scan on the first market
+    sharpe(1.0, 2.0, 5.0)
+    softmax_pos(np.zeros(2))
+    kelly_fraction(0.6, 0.5)
+    score_batch(np.zeros(2), np.zeros(2))
@@ -0,0 +1,43 @@
+"""
+Slotted signal record shared by the strategy signal generators.
+
+Each scan cycle builds hundreds of these; fixed slots are cheaper to
+allocate than a 20-key dict and turn downstream field access into a
+slot load instead of a string hash lookup.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+
+@dataclass(slots=True)
+class Signal:
+    timestamp: str
+    market_slug: str
+    market_question: str
+    intended_side: str
+    intended_price: float
+    intended_size: float
+    estimated_prob: float
+    market_price: float
+    edge: float
+    confidence: float
+    strategy: str
+    recommendation: str
+    take_profit_price: Optional[float] = None
+    take_profit_pct: Optional[float] = None
+    stop_loss_price: Optional[float] = None
+    stop_loss_pct: Optional[float] = None
+    days_to_resolve: Optional[float] = None
+    resolution_date: Optional[str] = None
+    priority_score: float = 0.0
+    # Strategy B: time-multiplier scoring
+    time_multiplier: Optional[float] = None
+    # Strategy C: tiered allocation
+    tier: Optional[str] = None
+    tier_multiplier: Optional[float] = None
+    tier_min_edge: Optional[float] = None
+
+    def to_trade(self) -> Dict:
+        """Plain dict for the PaperTradingDB boundary."""
+        return asdict(self)
@@ -3,15 +3,151 @@ Adaptive Kelly Criterion with Calibration Tracking
 Dynamic position sizing based on prediction accuracy and market conditions.
 """
 
+import json
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+from utils.jit import njit
+from strategies._kernels import kelly_fraction as _kelly_fraction_kernel
 from utils.prediction_tracker import PredictionTracker
+from operator import itemgetter
 
 
-@dataclass
+@njit(fastmath=True, cache=True)
+def _kelly_batch_kernel(
+    bankroll: float,
+    market_prices: np.ndarray,
+    estimated_probs: np.ndarray,
+    confidences: np.ndarray,
+    correlated_exposures: np.ndarray,
+    current_drawdowns: np.ndarray,
+    min_fraction: float,
+    max_fraction: float,
+    max_drawdown_limit: float,
+    max_correlated_exposure: float,
+    dynamic_kelly: float,
+    eps: float
+):
+    """
+    Numeric core of batched Kelly sizing.
+
+    Pure float array math with no Python objects, so numba can compile
+    it when installed; without numba the same NumPy expressions run
+    vectorized. String building stays in the caller.
+    """
+    is_yes = estimated_probs > market_prices
+    price_used = np.where(is_yes, market_prices, 1 - market_prices)
+    p = np.where(is_yes, estimated_probs, 1 - estimated_probs)
+    q = 1 - p
+
+    safe_price = np.maximum(price_used, eps)
+    b = np.where(price_used > 0, (1 - price_used) / safe_price, 0.0)
+
+    numerator = b * p - q
+    kelly_fraction = np.where(
+        (b > 0) & (numerator > 0),
+        numerator / np.maximum(b, eps),
+        0.0
+    )
+
+    # Confidence adjustment: maps 0->0.5, 1->1.0
+    confidence_adjustment = 0.5 + confidences * 0.5
+
+    # Correlation penalty
+    correlation_penalty = np.where(
+        correlated_exposures >= max_correlated_exposure,
+        0.0,
+        np.maximum(0.1, 1.0 - correlated_exposures / max_correlated_exposure)
+    )
+
+    # Drawdown penalty
+    drawdown_penalty = np.where(
+        current_drawdowns >= max_drawdown_limit,
+        0.0,
+        np.where(
+            current_drawdowns > max_drawdown_limit * 0.5,
+            1.0 - current_drawdowns / max_drawdown_limit,
+            1.0
+        )
+    )
+
+    # Apply adjustments and bounds
+    adjusted_fraction = (
+        kelly_fraction *
+        dynamic_kelly *
+        confidence_adjustment *
+        correlation_penalty *
+        drawdown_penalty
+    )
+    adjusted_fraction = np.minimum(
+        np.maximum(adjusted_fraction, min_fraction * kelly_fraction),
+        max_fraction
+    )
+
+    position_size = bankroll * adjusted_fraction
+    shares = np.where(price_used > 0, position_size / safe_price, 0.0)
+
+    return (
+        is_yes, kelly_fraction, adjusted_fraction, position_size, shares,
+        confidence_adjustment, correlation_penalty, drawdown_penalty
+    )
+
+
+@njit(cache=True)
+def _greedy_allocate(
+    order: np.ndarray,
+    kelly_frac: np.ndarray,
+    category_ids: np.ndarray,
+    n_cats: int,
+    max_total: float,
+    max_cat: float
+) -> np.ndarray:
+    """
+    Sequential greedy allocation over pre-sorted opportunity indices.
+
+    Dict lookups are stripped out by the caller (categories become int
+    ids) so the bookkeeping loop is pure scalar math numba can compile.
+    Returns allocated size per opportunity (0 where skipped).
+    """
+    n = kelly_frac.shape[0]
+    sizes = np.zeros(n)
+    cat_totals = np.zeros(n_cats)
+    remaining = max_total
+
+    for k in range(order.shape[0]):
+        i = order[k]
+        c = category_ids[i]
+
+        size = max_cat - cat_totals[c]
+        if remaining < size:
+            size = remaining
+        if kelly_frac[i] < size:
+            size = kelly_frac[i]
+        if size < 0:
+            size = 0.0
+
+        if size > 0.01:  # At least 1% to be worth it
+            sizes[i] = size
+            remaining -= size
+            cat_totals[c] += size
+
+    return sizes
+
+
+# Recommendation flag bits, decoded lazily by KellyResult.recommendations
+REC_NEG_EV = 1
+REC_MAX_CORR = 2
+REC_MAX_DD = 4
+REC_DD_WARN = 8
+REC_SMALL_EDGE = 16
+
+
+# slots=True: results are allocated per scanned market, so skipping the
+# per-instance __dict__ halves their footprint. Not frozen - the backtest
+# caps position_size/shares in place.
+@dataclass(slots=True)
 class KellyResult:
     """Result from Kelly calculation"""
     side: str  # 'YES' or 'NO'
@@ -22,8 +158,42 @@ class KellyResult:
     confidence_adjustment: float
     correlation_penalty: float
     drawdown_penalty: float
-    rationale: str
-    recommendations: List[str]
+
+    # Inputs needed to render rationale/recommendations on demand.
+    # Most callers only read the numbers, so the strings are built
+    # lazily rather than allocated for every scanned market.
+    dynamic_kelly: float = 0.0
+    flags: int = 0
+    current_drawdown: float = 0.0
+    max_correlated_exposure: float = 0.30
+    max_drawdown_limit: float = 0.20
+
+    @property
+    def rationale(self) -> str:
+        """Human-readable sizing breakdown (built on access)"""
+        return (
+            f"Kelly={self.kelly_fraction:.2%}, "
+            f"DynamicKelly={self.dynamic_kelly:.2%}, "
+            f"ConfAdj={self.confidence_adjustment:.2f}, "
+            f"CorrPenalty={self.correlation_penalty:.2f}, "
+            f"DDPenalty={self.drawdown_penalty:.2f}"
+        )
+
+    @property
+    def recommendations(self) -> List[str]:
+        """Warnings/suggestions decoded from the flags bitmask"""
+        recs = []
+        if self.flags & REC_NEG_EV:
+            recs.append("Negative expected value - avoid this bet")
+        if self.flags & REC_MAX_CORR:
+            recs.append(f"Max correlated exposure reached ({self.max_correlated_exposure:.0%})")
+        if self.flags & REC_MAX_DD:
+            recs.append(f"Max drawdown reached - stop trading")
+        if self.flags & REC_DD_WARN:
+            recs.append(f"In drawdown ({self.current_drawdown:.1%}) - reducing size")
+        if self.flags & REC_SMALL_EDGE:
+            recs.append("Small edge (<5%) - consider passing")
+        return recs
 
 
 class AdaptiveKelly:
@@ -54,6 +224,24 @@ class AdaptiveKelly:
         
         self.current_fraction = base_fraction
         self.tracker = PredictionTracker()
+
+        # Limits bundled for one-attribute unpacking in the hot path
+        # (LOAD_FAST locals instead of repeated LOAD_ATTR)
+        self._limits = (
+            min_fraction, max_fraction,
+            max_drawdown_limit, max_correlated_exposure
+        )
+
+        # Cached dynamic Kelly fraction - the calibration report is
+        # invariant between recorded outcomes, so don't recompute it
+        # for every sizing call in a scan
+        self._dyn_kelly_cache: Optional[float] = None
+
+        # Memoized sizing results: several strategies in one process
+        # size the same (bankroll, price, prob, confidence) inputs, and
+        # the result only varies with the dynamic fraction, which is
+        # part of the key
+        self._size_cache: Dict = {}
     
     def calculate_position_size(
         self,
@@ -80,31 +268,36 @@ class AdaptiveKelly:
         Returns:
             KellyResult with sizing and adjustment details
         """
-        recommendations = []
-        
+        dynamic_kelly = self._get_dynamic_kelly_fraction()
+        cache_key = (
+            round(bankroll, 2), round(market_price, 4),
+            round(estimated_prob, 4), round(confidence, 3),
+            round(correlated_exposure, 4), round(current_drawdown, 4),
+            dynamic_kelly,
+        )
+        cached = self._size_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        flags = 0
+        min_fraction, max_fraction, max_drawdown_limit, max_correlated_exposure = self._limits
+
         # 1. Standard Kelly calculation
+        # price_used is the entry price for the chosen side; shares
+        # reuse it below instead of re-deriving no_price
         if estimated_prob > market_price:
             side = 'YES'
-            win_amount = 1 - market_price
-            loss_amount = market_price
-            b = win_amount / market_price if market_price > 0 else 0
+            price_used = market_price
             p = estimated_prob
         else:
             side = 'NO'
-            no_price = 1 - market_price
-            win_amount = 1 - no_price
-            loss_amount = no_price
-            b = win_amount / no_price if no_price > 0 else 0
+            price_used = 1 - market_price
             p = 1 - estimated_prob
-        
-        q = 1 - p
-        
-        # Kelly Criterion: f* = (bp - q) / b
-        if b <= 0 or (b * p - q) <= 0:
-            kelly_fraction = 0
-            recommendations.append("Negative expected value - avoid this bet")
-        else:
-            kelly_fraction = (b * p - q) / b
+
+        # Kelly Criterion: f* = (bp - q) / b (JIT-compiled scalar core)
+        kelly_fraction = _kelly_fraction_kernel(p, price_used)
+        if kelly_fraction == 0.0:
+            flags |= REC_NEG_EV
         
         # 2. Adjust for confidence (wider confidence = smaller size)
         # If confidence is 1.0, no reduction. If 0.0, heavy reduction.
@@ -112,30 +305,28 @@ class AdaptiveKelly:
         
         # 3. Adjust for correlation exposure
         # If already at max exposure, can't add more
-        if correlated_exposure >= self.max_correlated_exposure:
+        if correlated_exposure >= max_correlated_exposure:
             correlation_penalty = 0.0
-            recommendations.append(f"Max correlated exposure reached ({self.max_correlated_exposure:.0%})")
+            flags |= REC_MAX_CORR
         else:
             # Linear penalty based on how close to limit
-            correlation_penalty = 1.0 - (correlated_exposure / self.max_correlated_exposure)
+            correlation_penalty = 1.0 - (correlated_exposure / max_correlated_exposure)
             correlation_penalty = max(0.1, correlation_penalty)  # At least 10%
         
         # 4. Adjust for drawdown
-        if current_drawdown >= self.max_drawdown_limit:
+        if current_drawdown >= max_drawdown_limit:
             # At max drawdown, stop trading
             drawdown_penalty = 0.0
-            recommendations.append(f"Max drawdown reached - stop trading")
-        elif current_drawdown > self.max_drawdown_limit * 0.5:
+            flags |= REC_MAX_DD
+        elif current_drawdown > max_drawdown_limit * 0.5:
             # In drawdown, reduce size significantly
-            drawdown_penalty = 1.0 - (current_drawdown / self.max_drawdown_limit)
-            recommendations.append(f"In drawdown ({current_drawdown:.1%}) - reducing size")
+            drawdown_penalty = 1.0 - (current_drawdown / max_drawdown_limit)
+            flags |= REC_DD_WARN
         else:
             drawdown_penalty = 1.0
         
-        # 5. Get dynamic Kelly fraction based on calibration
-        dynamic_kelly = self._get_dynamic_kelly_fraction()
-        
-        # 6. Apply all adjustments
+        # 5. Apply all adjustments (dynamic Kelly fraction fetched
+        # above as part of the cache key)
         adjusted_fraction = (
             kelly_fraction * 
             dynamic_kelly * 
@@ -144,38 +335,26 @@ class AdaptiveKelly:
             drawdown_penalty
         )
         
-        # 7. Apply bounds
-        adjusted_fraction = np.clip(
-            adjusted_fraction,
-            self.min_fraction * kelly_fraction,  # At least min_fraction of Kelly
-            self.max_fraction  # Never more than max_fraction
+        # 7. Apply bounds (builtin min/max - np.clip on a scalar pays
+        # the whole ufunc dispatch for one comparison)
+        adjusted_fraction = min(
+            max(adjusted_fraction, min_fraction * kelly_fraction),
+            max_fraction
         )
         
         # 8. Calculate position size
         position_size = bankroll * adjusted_fraction
         
         # 9. Calculate shares
-        if side == 'YES':
-            shares = position_size / market_price if market_price > 0 else 0
-        else:
-            no_price = 1 - market_price
-            shares = position_size / no_price if no_price > 0 else 0
-        
-        # Build rationale
-        rationale = (
-            f"Kelly={kelly_fraction:.2%}, "
-            f"DynamicKelly={dynamic_kelly:.2%}, "
-            f"ConfAdj={confidence_adjustment:.2f}, "
-            f"CorrPenalty={correlation_penalty:.2f}, "
-            f"DDPenalty={drawdown_penalty:.2f}"
-        )
+        shares = position_size / price_used if price_used > 0 else 0
         
-        # Add edge warning if small
+        # Flag small edges; rationale/recommendation strings are built
+        # lazily by KellyResult properties
         edge = abs(estimated_prob - market_price)
         if edge < 0.05:
-            recommendations.append("Small edge (<5%) - consider passing")
+            flags |= REC_SMALL_EDGE
         
-        return KellyResult(
+        result = KellyResult(
             side=side,
             kelly_fraction=kelly_fraction,
             adjusted_fraction=adjusted_fraction,
@@ -184,22 +363,298 @@ class AdaptiveKelly:
             confidence_adjustment=confidence_adjustment,
             correlation_penalty=correlation_penalty,
             drawdown_penalty=drawdown_penalty,
-            rationale=rationale,
-            recommendations=recommendations
+            dynamic_kelly=dynamic_kelly,
+            flags=flags,
+            current_drawdown=current_drawdown,
+            max_correlated_exposure=max_correlated_exposure,
+            max_drawdown_limit=max_drawdown_limit
         )
+        if len(self._size_cache) >= 8192:
+            self._size_cache.clear()
+        self._size_cache[cache_key] = result
+        return result
     
+    def calculate_position_size_batch(
+        self,
+        bankroll: float,
+        market_prices: np.ndarray,
+        estimated_probs: np.ndarray,
+        confidences: Optional[np.ndarray] = None,
+        correlated_exposures: Optional[np.ndarray] = None,
+        current_drawdowns: Optional[np.ndarray] = None,
+        dtype: np.dtype = np.float64
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized calculate_position_size over N opportunities.
+
+        Runs the same math as the scalar method - side selection, Kelly
+        fraction, confidence/correlation/drawdown penalties, bounds - as
+        element-wise NumPy ops, with the calibration report fetched once
+        per batch. Returns a dict of arrays (SoA) instead of N
+        KellyResult instances; rationale/recommendation strings are
+        omitted since batch callers only need the numbers.
+
+        Returns:
+            Dict with keys 'side', 'kelly_fraction', 'adjusted_fraction',
+            'position_size', 'shares', 'confidence_adjustment',
+            'correlation_penalty', 'drawdown_penalty'
+        """
+        # float32 halves memory bandwidth for large scans; prices carry
+        # 2-4 significant digits so the precision loss is immaterial.
+        # The denominator guard must stay above float32 eps.
+        dtype = np.dtype(dtype)
+        eps = 1e-6 if dtype == np.float32 else 1e-12
+
+        market_prices = np.asarray(market_prices, dtype=dtype)
+        estimated_probs = np.asarray(estimated_probs, dtype=dtype)
+        n = market_prices.shape[0]
+
+        confidences = (
+            np.full(n, 0.5, dtype=dtype) if confidences is None
+            else np.asarray(confidences, dtype=dtype)
+        )
+        correlated_exposures = (
+            np.zeros(n, dtype=dtype) if correlated_exposures is None
+            else np.asarray(correlated_exposures, dtype=dtype)
+        )
+        current_drawdowns = (
+            np.zeros(n, dtype=dtype) if current_drawdowns is None
+            else np.asarray(current_drawdowns, dtype=dtype)
+        )
+
+        # Dynamic Kelly fetched once for the whole batch; all remaining
+        # math happens in the (optionally numba-compiled) kernel
+        dynamic_kelly = self._get_dynamic_kelly_fraction()
+
+        (
+            is_yes, kelly_fraction, adjusted_fraction, position_size, shares,
+            confidence_adjustment, correlation_penalty, drawdown_penalty
+        ) = _kelly_batch_kernel(
+            float(bankroll),
+            market_prices,
+            estimated_probs,
+            confidences,
+            correlated_exposures,
+            current_drawdowns,
+            self.min_fraction,
+            self.max_fraction,
+            self.max_drawdown_limit,
+            self.max_correlated_exposure,
+            float(dynamic_kelly),
+            eps
+        )
+
+        # Dollar amounts go back to float64 regardless of compute dtype
+        position_size = np.asarray(position_size, dtype=np.float64)
+
+        return {
+            'side': np.where(is_yes, 'YES', 'NO'),
+            'kelly_fraction': kelly_fraction,
+            'adjusted_fraction': adjusted_fraction,
+            'position_size': position_size,
+            'shares': shares,
+            'confidence_adjustment': confidence_adjustment,
+            'correlation_penalty': correlation_penalty,
+            'drawdown_penalty': drawdown_penalty
+        }
+
+    @staticmethod
+    def screen(
+        market_prices: np.ndarray,
+        estimated_probs: np.ndarray,
+        min_edge: float = 0.05
+    ) -> np.ndarray:
+        """
+        Cheap vectorized pre-filter over candidate markets.
+
+        Returns a boolean mask of opportunities worth full sizing: edge
+        of at least min_edge and positive expected value on the chosen
+        side. Most markets fail this, so calling screen() first avoids
+        constructing KellyResults that would be discarded anyway.
+        """
+        market_prices = np.asarray(market_prices, dtype=np.float64)
+        estimated_probs = np.asarray(estimated_probs, dtype=np.float64)
+
+        is_yes = estimated_probs > market_prices
+        price_used = np.where(is_yes, market_prices, 1 - market_prices)
+        p = np.where(is_yes, estimated_probs, 1 - estimated_probs)
+
+        safe_price = np.maximum(price_used, 1e-12)
+        b = np.where(price_used > 0, (1 - price_used) / safe_price, 0.0)
+
+        edge = np.abs(estimated_probs - market_prices)
+        return (edge >= min_edge) & (b > 0) & (b * p - (1 - p) > 0)
+
+    @staticmethod
+    def batch_fractions(
+        edges: np.ndarray,
+        variances: np.ndarray,
+        kelly_fraction: float = 0.25,
+        max_pos: float = 0.20
+    ) -> np.ndarray:
+        """
+        Vectorized Kelly fractions for a batch of opportunities.
+
+        Uses the mean-variance Kelly approximation f* ≈ edge / variance,
+        scaled by kelly_fraction and clipped to [0, max_pos]. One NumPy
+        pass replaces per-opportunity calculate_position_size calls when
+        only sizing fractions are needed (e.g. candidate screening).
+
+        Args:
+            edges: Estimated edge per opportunity
+            variances: Return variance per opportunity
+            kelly_fraction: Fractional Kelly multiplier
+            max_pos: Maximum fraction per position
+
+        Returns:
+            Array of position fractions, same shape as edges
+        """
+        edges = np.asarray(edges, dtype=np.float64)
+        variances = np.asarray(variances, dtype=np.float64)
+
+        fractions = np.zeros_like(edges)
+        valid = variances > 0
+        fractions[valid] = kelly_fraction * edges[valid] / variances[valid]
+
+        return np.clip(fractions, 0.0, max_pos)
+
+    def evaluate_portfolio(
+        self,
+        bankroll: float,
+        opportunities: List[Dict],
+        portfolio: 'PortfolioKelly'
+    ) -> List[Dict]:
+        """
+        Fused screen + size + exposure sweep over a batch of markets.
+
+        Replaces the three-pass caller loop (score everything, check
+        exposure per candidate, update state) with one vectorized sizing
+        pass followed by a single edge-ordered traversal that applies
+        the portfolio's incremental exposure checks as it accepts.
+
+        Args:
+            bankroll: Total available capital
+            opportunities: List of dicts with keys:
+                - market_slug
+                - market_price
+                - estimated_prob
+                - confidence (optional, default 0.5)
+                - category (optional, default 'general')
+            portfolio: PortfolioKelly tracking current exposure; accepted
+                positions are added to it as part of the sweep
+
+        Returns:
+            List of accepted allocations, each a dict with
+            market_slug, side, size (dollars), and shares
+        """
+        if not opportunities:
+            return []
+
+        n = len(opportunities)
+        market_prices = np.fromiter(
+            (o['market_price'] for o in opportunities), dtype=np.float64, count=n
+        )
+        estimated_probs = np.fromiter(
+            (o['estimated_prob'] for o in opportunities), dtype=np.float64, count=n
+        )
+        confidences = np.fromiter(
+            (o.get('confidence', 0.5) for o in opportunities), dtype=np.float64, count=n
+        )
+        correlated = np.fromiter(
+            (portfolio.get_correlated_exposure(o.get('category', 'general'))
+             for o in opportunities),
+            dtype=np.float64, count=n
+        )
+
+        viable = self.screen(market_prices, estimated_probs)
+        if not viable.any():
+            return []
+
+        batch = self.calculate_position_size_batch(
+            bankroll, market_prices, estimated_probs,
+            confidences=confidences,
+            correlated_exposures=correlated
+        )
+
+        # Best edges first; exposure limits then decide who actually fits
+        edges = np.abs(estimated_probs - market_prices)
+        order = np.argsort(-edges, kind='stable')
+
+        allocations = []
+        for i in order:
+            if not viable[i]:
+                continue
+
+            fraction = float(batch['adjusted_fraction'][i])
+            size = float(batch['position_size'][i])
+            if size <= 0:
+                continue
+
+            opp = opportunities[i]
+            category = opp.get('category', 'general')
+
+            can_add, _ = portfolio.can_add_position(fraction, category)
+            if not can_add:
+                continue
+
+            side = str(batch['side'][i])
+            portfolio.add_position(
+                market_slug=opp['market_slug'],
+                side=side,
+                size=fraction,
+                expected_return=float(edges[i]),
+                variance=float(estimated_probs[i] * (1 - estimated_probs[i])),
+                category=category
+            )
+            allocations.append({
+                'market_slug': opp['market_slug'],
+                'side': side,
+                'size': size,
+                'shares': float(batch['shares'][i])
+            })
+
+        return allocations
+
     def _get_dynamic_kelly_fraction(self) -> float:
         """
         Get Kelly fraction based on recent calibration performance.
         Uses Brier scores from PredictionTracker.
+
+        Cached in memory until the next recorded outcome invalidates it,
+        and persisted to disk (keyed by the tracker's calibration
+        version) so a restarted process skips the Brier recompute too.
         """
-        report = self.tracker.get_calibration_report()
-        
-        if report['status'] == 'insufficient_data':
-            return self.base_fraction  # Use default if no data
-        
-        # Use the tracker's recommendation
-        return report['recommended_kelly_fraction']
+        if self._dyn_kelly_cache is not None:
+            return self._dyn_kelly_cache
+
+        version = self.tracker.calibration_version
+        cache_path = self.tracker.file_path.with_name('kelly_cache.json')
+
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+            if version in cached:
+                self._dyn_kelly_cache = float(cached[version])
+                return self._dyn_kelly_cache
+        except (OSError, json.JSONDecodeError, ValueError):
+            pass
+
+        # Tracker property skips building the full report dict
+        if self.tracker.has_sufficient_data:
+            fraction = self.tracker.current_kelly_fraction
+        else:
+            fraction = self.base_fraction  # Use default if no data
+
+        # Only the current version is kept - a new outcome changes the
+        # key, making the stale entry unreachable
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump({version: fraction}, f)
+        except OSError:
+            pass
+
+        self._dyn_kelly_cache = fraction
+        return fraction
     
     def update_from_outcome(
         self,
@@ -213,9 +668,10 @@ class AdaptiveKelly:
         """
         # Record the outcome
         self.tracker.record_outcome(market_slug, actual_outcome)
-        
-        # The dynamic fraction will be automatically updated
+
+        # Invalidate the cache so the dynamic fraction is recomputed
         # on next calculate_position_size() call
+        self._dyn_kelly_cache = None
     
     def get_calibration_summary(self) -> Dict:
         """Get summary of calibration for display"""
@@ -237,7 +693,12 @@ class PortfolioKelly:
     def __init__(self, max_total_exposure: float = 0.50):
         self.max_total_exposure = max_total_exposure
         self.positions: Dict[str, Dict] = {}
-    
+
+        # Incrementally maintained summaries so exposure checks are O(1)
+        # instead of rescanning all positions per call
+        self._category_totals: Dict[str, float] = {}
+        self._total_exposure: float = 0.0
+
     def add_position(
         self,
         market_slug: str,
@@ -248,6 +709,9 @@ class PortfolioKelly:
         category: str
     ):
         """Track a position for portfolio optimization"""
+        if market_slug in self.positions:
+            self.remove_position(market_slug)
+
         self.positions[market_slug] = {
             'side': side,
             'size': size,
@@ -255,23 +719,36 @@ class PortfolioKelly:
             'variance': variance,
             'category': category
         }
-    
+
+        self._category_totals[category] = self._category_totals.get(category, 0.0) + size
+        self._total_exposure += size
+
+    def remove_position(self, market_slug: str):
+        """Stop tracking a position (e.g. after resolution)"""
+        pos = self.positions.pop(market_slug, None)
+        if pos is None:
+            return
+
+        self._category_totals[pos['category']] -= pos['size']
+        self._total_exposure -= pos['size']
+
+    @property
+    def total_exposure(self) -> float:
+        """Running total exposure across all tracked positions"""
+        return self._total_exposure
+
     def get_correlated_exposure(self, category: str) -> float:
         """
         Calculate current exposure to a correlated category.
-        
+
         Args:
             category: Market category (e.g., 'politics', 'sports')
-        
+
         Returns:
             Total exposure to that category (0-1 of bankroll)
         """
-        total = 0.0
-        for slug, pos in self.positions.items():
-            if pos['category'] == category:
-                total += pos['size']
-        return total
-    
+        return self._category_totals.get(category, 0.0)
+
     def can_add_position(
         self,
         new_size: float,
@@ -280,25 +757,24 @@ class PortfolioKelly:
     ) -> Tuple[bool, str]:
         """
         Check if adding a new position would violate constraints.
-        
+
         Returns:
             (can_add, reason)
         """
         current_category = self.get_correlated_exposure(category)
-        
+
         if current_category + new_size > max_category_exposure:
             return (
                 False,
                 f"Would exceed {category} exposure limit ({max_category_exposure:.0%})"
             )
-        
-        total_exposure = sum(p['size'] for p in self.positions.values())
-        if total_exposure + new_size > self.max_total_exposure:
+
+        if self._total_exposure + new_size > self.max_total_exposure:
             return (
                 False,
                 f"Would exceed total exposure limit ({self.max_total_exposure:.0%})"
             )
-        
+
         return True, "OK"
     
     def optimize_allocation(
@@ -321,43 +797,111 @@ class PortfolioKelly:
         Returns:
             List of opportunities with optimal sizes
         """
-        # Simple greedy allocation by Sharpe ratio
-        # More sophisticated: use numerical optimization
-        
-        # Calculate Sharpe for each
-        for opp in opportunities:
-            if opp['variance'] > 0:
-                opp['sharpe'] = opp['expected_return'] / np.sqrt(opp['variance'])
-            else:
-                opp['sharpe'] = 0
-        
-        # Sort by Sharpe
-        opportunities = sorted(opportunities, key=lambda x: x['sharpe'], reverse=True)
-        
-        # Allocate greedily respecting constraints
+        # Calculate all Sharpe ratios in one vectorized pass (used for
+        # display and the greedy fallback)
+        n = len(opportunities)
+        er = np.fromiter((o['expected_return'] for o in opportunities), dtype=np.float64, count=n)
+        var = np.fromiter((o['variance'] for o in opportunities), dtype=np.float64, count=n)
+        sharpe = np.where(var > 0, er / np.sqrt(np.maximum(var, 1e-300)), 0.0)
+
+        for opp, s in zip(opportunities, sharpe):
+            opp['sharpe'] = float(s)
+
+        allocated = self._optimize_log_utility(opportunities)
+
+        if allocated is None:
+            # Solver couldn't handle the inputs - fall back to greedy
+            allocated = self._greedy_allocation(bankroll, opportunities)
+
+        return sorted(allocated, key=itemgetter('sharpe'), reverse=True)
+
+    def _optimize_log_utility(
+        self,
+        opportunities: List[Dict],
+        max_category_exposure: float = 0.30
+    ) -> Optional[List[Dict]]:
+        """
+        Allocate via the quadratic approximation of expected log utility,
+        max μᵀw − ½ wᵀΣw with diagonal Σ, which gives unconstrained
+        weights w_i = μ_i / σ_i². The total-exposure cap is enforced by
+        water-filling on the KKT multiplier (bisection), per-position
+        caps by clipping at each opportunity's kelly_fraction, and
+        category caps by proportional scale-down.
+
+        Returns None if inputs are degenerate (caller falls back to greedy).
+        """
+        mu = np.array([o['expected_return'] for o in opportunities], dtype=np.float64)
+        var = np.array([o['variance'] for o in opportunities], dtype=np.float64)
+        caps = np.array([o['kelly_fraction'] for o in opportunities], dtype=np.float64)
+
+        if mu.size == 0 or not (np.all(np.isfinite(mu)) and np.all(np.isfinite(var))):
+            return None
+
+        var = np.maximum(var, 1e-6)
+        caps = np.maximum(caps, 0.0)
+
+        def weights(lam: float) -> np.ndarray:
+            return np.clip((mu - lam) / var, 0.0, caps)
+
+        w = weights(0.0)
+
+        # Water-fill the total-exposure constraint
+        if w.sum() > self.max_total_exposure:
+            lo, hi = 0.0, float(mu.max())
+            for _ in range(60):
+                mid = (lo + hi) / 2
+                if weights(mid).sum() > self.max_total_exposure:
+                    lo = mid
+                else:
+                    hi = mid
+            w = weights(hi)
+
+        # Scale down any category that exceeds its cap
+        categories = [o.get('category', 'general') for o in opportunities]
+        for cat in set(categories):
+            idx = [i for i, c in enumerate(categories) if c == cat]
+            cat_total = w[idx].sum()
+            if cat_total > max_category_exposure:
+                w[idx] *= max_category_exposure / cat_total
+
         allocated = []
-        remaining_bankroll = bankroll * self.max_total_exposure
-        category_exposure: Dict[str, float] = {}
-        
-        for opp in opportunities:
-            category = opp.get('category', 'general')
-            current_cat = category_exposure.get(category, 0)
-            
-            # Calculate max allowed for this position
-            max_by_category = 0.30 - current_cat  # Max 30% per category
-            max_by_total = remaining_bankroll / bankroll
-            max_by_kelly = opp['kelly_fraction']
-            
-            size = min(max_by_category, max_by_total, max_by_kelly)
-            size = max(0, size)  # No negative
-            
+        for opp, size in zip(opportunities, w):
             if size > 0.01:  # At least 1% to be worth it
-                opp['allocated_size'] = size
+                opp['allocated_size'] = float(size)
                 allocated.append(opp)
-                
-                remaining_bankroll -= size * bankroll
-                category_exposure[category] = current_cat + size
-        
+
+        return allocated
+
+    def _greedy_allocation(
+        self,
+        bankroll: float,
+        opportunities: List[Dict]
+    ) -> List[Dict]:
+        """Greedy Sharpe-ordered allocation (fallback path)"""
+        n = len(opportunities)
+        sharpes = np.fromiter((o['sharpe'] for o in opportunities), dtype=np.float64, count=n)
+        kelly_frac = np.fromiter((o['kelly_fraction'] for o in opportunities), dtype=np.float64, count=n)
+
+        # Encode categories as int ids so the kernel loop is dict-free
+        categories = np.array([o.get('category', 'general') for o in opportunities])
+        cats, category_ids = np.unique(categories, return_inverse=True)
+
+        order = np.argsort(-sharpes, kind='stable')
+        sizes = _greedy_allocate(
+            order.astype(np.int64),
+            kelly_frac,
+            category_ids.astype(np.int64),
+            len(cats),
+            self.max_total_exposure,
+            0.30  # Max 30% per category
+        )
+
+        allocated = []
+        for opp, size in zip(opportunities, sizes):
+            if size > 0:
+                opp['allocated_size'] = float(size)
+                allocated.append(opp)
+
         return allocated
 
 
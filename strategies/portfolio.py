@@ -5,17 +5,20 @@ Diversified strategies reduce tail risk and provide robustness to model failure.
 """
 
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Protocol, Tuple
 from dataclasses import dataclass
 from datetime import datetime
-from abc import ABC, abstractmethod
 
 from models.edge_estimator import EnsembleEdgeEstimator, EdgeEstimate
+from strategies._kernels import sharpe as _sharpe_kernel, softmax_pos
 from strategies.adaptive_kelly import AdaptiveKelly, PortfolioKelly
 from utils.prediction_tracker import PredictionTracker
 
 
-@dataclass
+# slots=True on both result types: cycles produce hundreds of these, and
+# dropping the per-instance __dict__ shrinks and speeds them up
+@dataclass(slots=True)
 class StrategySignal:
     """Signal from a strategy"""
     market_slug: str
@@ -26,7 +29,7 @@ class StrategySignal:
     rationale: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioAllocation:
     """Portfolio allocation result"""
     market_slug: str
@@ -37,45 +40,95 @@ class PortfolioAllocation:
     sharpe_ratio: float
 
 
-class BaseStrategy(ABC):
-    """Abstract base class for trading strategies"""
-    
+class StrategyProtocol(Protocol):
+    """Anything the portfolio can dispatch signals to (typing only)"""
+
+    def generate_signal(self, market_slug: str, **kwargs) -> Optional['StrategySignal']:
+        ...
+
+
+class BaseStrategy:
+    """Base class for trading strategies.
+
+    Plain class rather than abc.ABC - generate_signal is dispatched per
+    market per strategy, and skipping the abstract-method machinery
+    keeps that lookup on the interpreter fast path. Subclasses that
+    forget to implement it get NotImplementedError on first use.
+    """
+
+    WINDOW = 100  # Trades kept for performance stats
+
     def __init__(self, name: str):
         self.name = name
-        self.performance_history: List[float] = []
-    
-    @abstractmethod
+
+        # Preallocated ring buffer: O(1) append with no allocation, and
+        # the window feeds NumPy directly without list conversion
+        self._buf = np.empty(self.WINDOW, np.float64)
+        self._head = 0
+        self._count = 0
+
+        # Rolling moments so Sharpe/win-rate are O(1) per call -
+        # allocate_capital asks for them on every market, and rebuilding
+        # a NumPy array from the history each time dominated that loop
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._wins = 0
+        self._cached_sharpe: Optional[float] = None
+
+    @property
+    def performance_history(self) -> np.ndarray:
+        """Recorded trade P&Ls in the stats window, oldest first"""
+        if self._count < self.WINDOW:
+            return self._buf[:self._count]
+        return np.concatenate((self._buf[self._head:], self._buf[:self._head]))
+
     def generate_signal(self, market_slug: str, **kwargs) -> Optional[StrategySignal]:
         """Generate trading signal for a market"""
-        pass
-    
+        raise NotImplementedError
+
     def record_result(self, pnl: float):
         """Record P&L for performance tracking"""
-        self.performance_history.append(pnl)
-        # Keep last 100 trades
-        self.performance_history = self.performance_history[-100:]
-    
+        # When the window is full the write slot holds the oldest trade;
+        # subtract its contribution before overwriting
+        if self._count == self.WINDOW:
+            old = self._buf[self._head]
+            self._sum -= old
+            self._sumsq -= old * old
+            if old > 0:
+                self._wins -= 1
+        else:
+            self._count += 1
+
+        self._buf[self._head] = pnl
+        self._head = (self._head + 1) % self.WINDOW
+
+        self._sum += pnl
+        self._sumsq += pnl * pnl
+        if pnl > 0:
+            self._wins += 1
+
+        self._cached_sharpe = None
+
     def get_sharpe_ratio(self) -> float:
         """Calculate Sharpe ratio from performance history"""
-        if len(self.performance_history) < 5:
+        if self._cached_sharpe is not None:
+            return self._cached_sharpe
+
+        n = self._count
+        if n < 5:
             return 1.0  # Default for new strategies
-        
-        returns = np.array(self.performance_history)
-        avg_return = np.mean(returns)
-        std_return = np.std(returns)
-        
-        if std_return == 0:
-            return 1.0 if avg_return > 0 else 0.0
-        
-        return avg_return / std_return
-    
+
+        sharpe = float(_sharpe_kernel(self._sum, self._sumsq, float(n)))
+
+        self._cached_sharpe = sharpe
+        return sharpe
+
     def get_win_rate(self) -> float:
         """Calculate win rate"""
-        if not self.performance_history:
+        if self._count == 0:
             return 0.5
-        
-        wins = sum(1 for p in self.performance_history if p > 0)
-        return wins / len(self.performance_history)
+
+        return self._wins / self._count
 
 
 class SentimentStrategy(BaseStrategy):
@@ -84,20 +137,23 @@ class SentimentStrategy(BaseStrategy):
     Good for longer-dated events.
     """
     
-    def __init__(self):
+    def __init__(self, estimator: Optional[EnsembleEdgeEstimator] = None):
         super().__init__('sentiment')
-        self.estimator = EnsembleEdgeEstimator()
+        self.estimator = estimator if estimator is not None else EnsembleEdgeEstimator()
     
     def generate_signal(self, market_slug: str, **kwargs) -> Optional[StrategySignal]:
         question = kwargs.get('question', '')
         current_price = kwargs.get('current_price', 0.5)
         category = kwargs.get('category', 'general')
         
-        # Use sentiment component of ensemble
-        estimate = self.estimator.estimate_probability(
-            market_slug, question, current_price, category
-        )
-        
+        # Use sentiment component of ensemble (precomputed by the
+        # portfolio when the estimator is shared across strategies)
+        estimate = kwargs.get('precomputed_estimate')
+        if estimate is None:
+            estimate = self.estimator.estimate_probability(
+                market_slug, question, current_price, category
+            )
+
         sentiment_pred = estimate.individual_predictions.get('sentiment', 0.5)
         edge = sentiment_pred - current_price
         
@@ -120,21 +176,21 @@ class MomentumStrategy(BaseStrategy):
     Good for trending markets.
     """
     
-    def __init__(self):
+    def __init__(self, estimator: Optional[EnsembleEdgeEstimator] = None):
         super().__init__('momentum')
-        self.estimator = EnsembleEdgeEstimator()
+        self.estimator = estimator if estimator is not None else EnsembleEdgeEstimator()
     
     def generate_signal(self, market_slug: str, **kwargs) -> Optional[StrategySignal]:
         current_price = kwargs.get('current_price', 0.5)
         
-        # Update price history
-        self.estimator.update_price(market_slug, current_price)
-        
         # Get momentum component
-        estimate = self.estimator.estimate_probability(
-            market_slug, '', current_price
-        )
-        
+        estimate = kwargs.get('precomputed_estimate')
+        if estimate is None:
+            self.estimator.update_price(market_slug, current_price)
+            estimate = self.estimator.estimate_probability(
+                market_slug, '', current_price
+            )
+
         momentum_pred = estimate.individual_predictions.get('momentum', 0.5)
         edge = momentum_pred - current_price
         
@@ -160,19 +216,20 @@ class MeanReversionStrategy(BaseStrategy):
     Good for oscillating markets at extremes.
     """
     
-    def __init__(self):
+    def __init__(self, estimator: Optional[EnsembleEdgeEstimator] = None):
         super().__init__('mean_reversion')
-        self.estimator = EnsembleEdgeEstimator()
+        self.estimator = estimator if estimator is not None else EnsembleEdgeEstimator()
     
     def generate_signal(self, market_slug: str, **kwargs) -> Optional[StrategySignal]:
         current_price = kwargs.get('current_price', 0.5)
         
-        self.estimator.update_price(market_slug, current_price)
-        
-        estimate = self.estimator.estimate_probability(
-            market_slug, '', current_price
-        )
-        
+        estimate = kwargs.get('precomputed_estimate')
+        if estimate is None:
+            self.estimator.update_price(market_slug, current_price)
+            estimate = self.estimator.estimate_probability(
+                market_slug, '', current_price
+            )
+
         reversion_pred = estimate.individual_predictions.get('mean_reversion', 0.5)
         edge = reversion_pred - current_price
         
@@ -242,21 +299,22 @@ class EnsembleStrategy(BaseStrategy):
     Most sophisticated, uses all signals.
     """
     
-    def __init__(self):
+    def __init__(self, estimator: Optional[EnsembleEdgeEstimator] = None):
         super().__init__('ensemble')
-        self.estimator = EnsembleEdgeEstimator()
+        self.estimator = estimator if estimator is not None else EnsembleEdgeEstimator()
     
     def generate_signal(self, market_slug: str, **kwargs) -> Optional[StrategySignal]:
         question = kwargs.get('question', '')
         current_price = kwargs.get('current_price', 0.5)
         category = kwargs.get('category', 'general')
         
-        self.estimator.update_price(market_slug, current_price)
-        
-        estimate = self.estimator.estimate_probability(
-            market_slug, question, current_price, category
-        )
-        
+        estimate = kwargs.get('precomputed_estimate')
+        if estimate is None:
+            self.estimator.update_price(market_slug, current_price)
+            estimate = self.estimator.estimate_probability(
+                market_slug, question, current_price, category
+            )
+
         edge = estimate.edge
         
         if abs(edge) < 0.03:
@@ -279,6 +337,14 @@ class StrategyPortfolio:
     Allocates capital across strategies based on their Sharpe ratios.
     Diversification reduces tail risk and provides robustness.
     """
+
+    MIN_TRADE_SIZE = 20  # Dollars - allocations below this aren't worth placing
+
+    # Per-market feature bits for strategy dispatch
+    FEAT_BOTH_PRICES = 1  # yes_price and no_price supplied
+    FEAT_QUESTION = 2  # non-empty question text
+    FEAT_EXTREME_PRICE = 4  # price at the <0.20 / >0.80 extremes
+    FEAT_PRICE = 8  # any priced market
     
     def __init__(
         self,
@@ -290,13 +356,18 @@ class StrategyPortfolio:
         self.max_total_exposure = max_total_exposure
         self.max_strategy_exposure = max_strategy_exposure
         
+        # One shared estimator across strategies - each used to own a
+        # duplicate, quadrupling estimate_probability calls and price
+        # history storage per market
+        self.estimator = EnsembleEdgeEstimator()
+
         # Initialize strategies
         self.strategies: Dict[str, BaseStrategy] = {
-            'sentiment': SentimentStrategy(),
-            'momentum': MomentumStrategy(),
-            'mean_reversion': MeanReversionStrategy(),
+            'sentiment': SentimentStrategy(self.estimator),
+            'momentum': MomentumStrategy(self.estimator),
+            'mean_reversion': MeanReversionStrategy(self.estimator),
             'arbitrage': ArbitrageStrategy(),
-            'ensemble': EnsembleStrategy(),
+            'ensemble': EnsembleStrategy(self.estimator),
         }
         
         self.kelly = AdaptiveKelly()
@@ -304,21 +375,85 @@ class StrategyPortfolio:
         self.tracker = PredictionTracker()
         
         self.active_allocations: List[PortfolioAllocation] = []
+
+        # Feature bits each strategy needs before it can emit a signal;
+        # generate_signals masks markets against this so strategies
+        # guaranteed to return None are never called
+        self._strategy_mask = {
+            'sentiment': self.FEAT_QUESTION,
+            'momentum': self.FEAT_PRICE,
+            'mean_reversion': self.FEAT_EXTREME_PRICE,
+            'arbitrage': self.FEAT_BOTH_PRICES,
+            'ensemble': self.FEAT_PRICE,
+        }
+
+        # Pool for overlapping per-strategy work when strategies run
+        # with independent estimators (see generate_signals)
+        self._pool = ThreadPoolExecutor(
+            max_workers=len(self.strategies),
+            thread_name_prefix='strategy'
+        )
     
-    def generate_signals(self, market_slug: str, **market_data) -> Dict[str, Optional[StrategySignal]]:
+    def generate_signals(
+        self,
+        market_slug: str,
+        use_shared_estimate: bool = True,
+        **market_data
+    ) -> Dict[str, Optional[StrategySignal]]:
         """
         Generate signals from all strategies.
-        
+
+        Args:
+            market_slug: Market identifier
+            use_shared_estimate: Compute the ensemble estimate once on
+                the shared estimator and hand it to every strategy. Set
+                False when strategies were wired with independent
+                estimators; their work is then overlapped on a thread
+                pool instead.
+
         Returns:
             Dict mapping strategy name to signal (or None)
         """
-        signals = {}
-        
-        for name, strategy in self.strategies.items():
-            signal = strategy.generate_signal(market_slug, **market_data)
-            signals[name] = signal
-        
-        return signals
+        if use_shared_estimate:
+            # One estimate_probability per market instead of one per
+            # strategy; the remaining per-strategy work is dict reads,
+            # not worth dispatching to threads
+            current_price = market_data.get('current_price', 0.5)
+            self.estimator.update_price(market_slug, current_price)
+            market_data['precomputed_estimate'] = self.estimator.estimate_probability(
+                market_slug,
+                market_data.get('question', ''),
+                current_price,
+                market_data.get('category', 'general')
+            )
+
+            # Feature mask: skip strategies that would just return None
+            # (arbitrage without both prices, sentiment without a
+            # question, mean reversion away from the extremes)
+            mask = self.FEAT_PRICE
+            if 'yes_price' in market_data and 'no_price' in market_data:
+                mask |= self.FEAT_BOTH_PRICES
+            if market_data.get('question'):
+                mask |= self.FEAT_QUESTION
+            if current_price < 0.20 or current_price > 0.80:
+                mask |= self.FEAT_EXTREME_PRICE
+
+            return {
+                name: (
+                    strategy.generate_signal(market_slug, **market_data)
+                    if mask & self._strategy_mask.get(name, self.FEAT_PRICE)
+                    else None
+                )
+                for name, strategy in self.strategies.items()
+            }
+
+        # Independent estimators: each strategy recomputes its own
+        # estimate, so overlap them on the pool
+        futures = {
+            name: self._pool.submit(strategy.generate_signal, market_slug, **market_data)
+            for name, strategy in self.strategies.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
     
     def allocate_capital(
         self,
@@ -343,43 +478,68 @@ class StrategyPortfolio:
             return allocations
         
         # Calculate strategy weights based on Sharpe ratios
-        sharpe_ratios = {
-            name: self.strategies[name].get_sharpe_ratio()
-            for name in valid_signals.keys()
-        }
-        
-        # Softmax to get weights
-        exp_sharpes = {k: np.exp(max(0, v)) for k, v in sharpe_ratios.items()}
-        total = sum(exp_sharpes.values())
-        weights = {k: v / total for k, v in exp_sharpes.items()}
-        
+        names = list(valid_signals)
+        sharpes = np.fromiter(
+            (self.strategies[name].get_sharpe_ratio() for name in names),
+            dtype=np.float64, count=len(names)
+        )
+
+        # Softmax to get weights (JIT-compiled kernel; max-subtraction
+        # keeps exp() from overflowing on large Sharpe values)
+        weights = softmax_pos(sharpes)
+
+        # Skip strategies whose slice of bankroll couldn't reach a
+        # tradeable size even before Kelly shrinks it further - when one
+        # Sharpe dominates the softmax, the rest aren't worth sizing
+        viable = weights * self.bankroll >= self.MIN_TRADE_SIZE
+        if not viable.all():
+            names = [name for name, keep in zip(names, viable) if keep]
+            sharpes = sharpes[viable]
+            weights = weights[viable]
+            if not names:
+                return allocations
+
+        # Size all signals in one vectorized Kelly pass instead of a
+        # per-strategy calculate_position_size call; sizes scale
+        # linearly with bankroll, so the per-strategy weight is applied
+        # after the shared-bankroll batch
+        n = len(names)
+        signs = np.fromiter(
+            (1.0 if valid_signals[name].direction == 'BUY_YES' else -1.0
+             for name in names),
+            dtype=np.float64, count=n
+        )
+        returns = np.fromiter(
+            (valid_signals[name].expected_return for name in names),
+            dtype=np.float64, count=n
+        )
+        probs = current_price + returns * signs
+        confs = np.fromiter(
+            (valid_signals[name].confidence for name in names),
+            dtype=np.float64, count=n
+        )
+
+        batch = self.kelly.calculate_position_size_batch(
+            self.bankroll,
+            np.full(n, current_price),
+            probs,
+            confidences=confs
+        )
+        sizes = batch['position_size'] * weights
+
         # Generate allocations
-        for strategy_name, signal in valid_signals.items():
-            weight = weights[strategy_name]
-            
-            # Calculate position size using Kelly
-            estimated_prob = current_price + signal.expected_return * np.sign(
-                1 if signal.direction == 'BUY_YES' else -1
-            )
-            
-            kelly_result = self.kelly.calculate_position_size(
-                bankroll=self.bankroll * weight,
-                market_price=current_price,
-                estimated_prob=estimated_prob,
-                confidence=signal.confidence
-            )
-            
-            if kelly_result.position_size > 0:
+        for i, strategy_name in enumerate(names):
+            if sizes[i] > 0:
                 allocation = PortfolioAllocation(
                     market_slug=market_slug,
-                    side=kelly_result.side,
-                    size=kelly_result.adjusted_fraction * weight,
+                    side=str(batch['side'][i]),
+                    size=float(batch['adjusted_fraction'][i] * weights[i]),
                     strategy=strategy_name,
-                    expected_return=signal.expected_return,
-                    sharpe_ratio=sharpe_ratios[strategy_name]
+                    expected_return=valid_signals[strategy_name].expected_return,
+                    sharpe_ratio=float(sharpes[i])
                 )
                 allocations.append(allocation)
-        
+
         return allocations
     
     def get_strategy_performance(self) -> Dict:
@@ -390,8 +550,8 @@ class StrategyPortfolio:
             performance[name] = {
                 'sharpe_ratio': strategy.get_sharpe_ratio(),
                 'win_rate': strategy.get_win_rate(),
-                'trades_count': len(strategy.performance_history),
-                'total_pnl': sum(strategy.performance_history) if strategy.performance_history else 0
+                'trades_count': strategy._count,
+                'total_pnl': float(np.sum(strategy.performance_history)) if strategy._count else 0
             }
         
         return performance
@@ -7,6 +7,13 @@ Maximum capital velocity strategy.
 import sys
 sys.path.insert(0, '/home/eduardoneville/projects/polymarket-trader')
 
+import calendar
+import functools
+import os
+import time
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 from utils.paper_trading_db import PaperTradingDB
@@ -15,6 +22,77 @@ from models.edge_estimator import EnsembleEdgeEstimator
 from strategies.adaptive_kelly import AdaptiveKelly
 from scanner import PolymarketScanner, Market
 
+# Parsed end_date cache shared across scan cycles - the same ISO strings
+# come back every fetch, so each is parsed once instead of per cycle
+_END_TS_CACHE: Dict[str, float] = {}
+
+
+def _end_timestamp(end_date: str) -> float:
+    """Epoch seconds for an ISO end date; NaN if missing or unparseable."""
+    if not end_date:
+        return float('nan')
+
+    ts = _END_TS_CACHE.get(end_date)
+    if ts is None:
+        # Polymarket dates arrive in the fixed shape
+        # YYYY-MM-DDTHH:MM:SS[.fff]Z - slice-to-int plus timegm skips
+        # fromisoformat and the replace() allocation; anything else
+        # falls back to the general parser
+        if end_date.endswith(('Z', '+00:00')) and len(end_date) >= 20:
+            try:
+                ts = float(calendar.timegm((
+                    int(end_date[0:4]), int(end_date[5:7]), int(end_date[8:10]),
+                    int(end_date[11:13]), int(end_date[14:16]), int(end_date[17:19]),
+                    0, 0, 0
+                )))
+            except ValueError:
+                ts = None
+        if ts is None:
+            try:
+                ts = datetime.fromisoformat(end_date.replace('Z', '+00:00')).timestamp()
+            except (ValueError, TypeError):
+                ts = float('nan')
+        _END_TS_CACHE[end_date] = ts
+    return ts
+
+
+# Lazy singletons shared across generator instances - batch backtests
+# spawn several strategy variants, and each used to redo scanner,
+# estimator, and DB setup from scratch
+@functools.lru_cache(maxsize=None)
+def _shared_scanner() -> PolymarketScanner:
+    from scanner import get_shared_scanner
+    return get_shared_scanner()
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_estimator() -> EnsembleEdgeEstimator:
+    return EnsembleEdgeEstimator()
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_db(db_path: str) -> PaperTradingDB:
+    return PaperTradingDB(db_path=db_path)
+
+
+# Lazily built per-process generator for the parallel scan path - the
+# estimator and Kelly models are reconstructed in each worker instead of
+# being pickled across
+_WORKER_GEN = None
+
+
+def _generate_signal_in_worker(payload):
+    """Process-pool worker: size one market with per-process state."""
+    global _WORKER_GEN
+    bankroll, min_edge, market, days, now_iso = payload
+
+    if (_WORKER_GEN is None
+            or _WORKER_GEN.bankroll != bankroll
+            or _WORKER_GEN.min_edge != min_edge):
+        _WORKER_GEN = StrategyASignalGenerator(bankroll=bankroll, min_edge=min_edge)
+
+    return _WORKER_GEN.generate_signal(market, days=days, now_iso=now_iso)
+
 
 class StrategyASignalGenerator:
     """
@@ -27,26 +105,29 @@ class StrategyASignalGenerator:
     STRATEGY_NAME = "Strategy_A_7day"
     DB_PATH = "data/paper_trading_strategy_a.db"
     
-    def __init__(self, bankroll: float = 1000, min_edge: float = 0.05):
+    def __init__(self, bankroll: float = 1000, min_edge: float = 0.05, parallel: bool = False):
         self.bankroll = bankroll
         self.min_edge = min_edge
-        self.db = PaperTradingDB(db_path=self.DB_PATH)
-        self.estimator = EnsembleEdgeEstimator()
+        self.parallel = parallel
+        self.db = _shared_db(self.DB_PATH)
+        self.estimator = _shared_estimator()
         self.kelly = AdaptiveKelly()
-        self.scanner = PolymarketScanner()
+        self.scanner = _shared_scanner()
     
-    def calculate_time_to_resolution(self, market: Market) -> Optional[float]:
-        """Calculate days until market resolution."""
-        if not market.end_date:
-            return None
-        
-        try:
-            end = datetime.fromisoformat(market.end_date.replace('Z', '+00:00'))
-            now = datetime.now(timezone.utc)
-            delta = end - now
-            return max(0, delta.days + delta.seconds / 86400)
-        except (ValueError, TypeError):
+    def calculate_time_to_resolution(self, market: Market, now_ts: Optional[float] = None) -> Optional[float]:
+        """Calculate days until market resolution.
+
+        Uses the cached epoch parser - this runs at least twice per
+        market per cycle, and float arithmetic on epoch seconds avoids
+        re-parsing the string and allocating datetime objects each time.
+        """
+        end_ts = _end_timestamp(market.end_date)
+        if end_ts != end_ts:  # NaN: missing or unparseable end date
             return None
+
+        if now_ts is None:
+            now_ts = time.time()
+        return max(0.0, (end_ts - now_ts) / 86400.0)
     
     def should_trade_market(self, market: Market) -> bool:
         """
@@ -71,8 +152,18 @@ class StrategyASignalGenerator:
         
         return True
     
-    def generate_signal(self, market: Market) -> Optional[Dict]:
-        """Generate trading signal for a market."""
+    def generate_signal(
+        self,
+        market: Market,
+        days: Optional[float] = None,
+        now_iso: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Generate trading signal for a market.
+
+        The cycle loop passes days (already computed by the prefilter)
+        and a shared now_iso timestamp so each signal skips a redundant
+        end-date calculation and a datetime allocation.
+        """
         self.estimator.update_price(market.slug, market.yes_price)
         
         estimate = self.estimator.estimate_probability(
@@ -109,10 +200,11 @@ class StrategyASignalGenerator:
             risk_pct=0.50
         )
         
-        days = self.calculate_time_to_resolution(market)
-        
+        if days is None:
+            days = self.calculate_time_to_resolution(market)
+
         signal = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now_iso if now_iso is not None else datetime.now().isoformat(),
             'market_slug': market.slug,
             'market_question': market.question,
             'intended_side': kelly_result.side,
@@ -137,12 +229,21 @@ class StrategyASignalGenerator:
     
     def get_current_exposure(self) -> float:
         """Get total exposure from open trades."""
+        return self._snapshot_state()[1]
+    
+    def _snapshot_state(self) -> tuple:
+        """Open trades and their total exposure from one DB read."""
         open_trades = self.db.get_open_trades()
-        return sum(t.get('intended_size', 0) for t in open_trades)
+        exposure = sum(t.get('intended_size', 0) for t in open_trades)
+        return open_trades, exposure
     
-    def generate_signals(self, max_markets: int = 100) -> List[Dict]:
-        """Generate signals for Strategy A."""
-        current_exposure = self.get_current_exposure()
+    def generate_signals(self, max_markets: int = 100, exposure: Optional[float] = None) -> List[Dict]:
+        """Generate signals for Strategy A.
+
+        run_cycle passes the exposure it already snapshotted so the
+        open-trades query isn't repeated within a cycle.
+        """
+        current_exposure = exposure if exposure is not None else self.get_current_exposure()
         available_capital = self.bankroll - current_exposure
         
         MIN_TRADE_SIZE = 20
@@ -151,17 +252,57 @@ class StrategyASignalGenerator:
             return []
         
         markets = self.scanner.get_active_markets(limit=200)
-        suitable = [m for m in markets if self.should_trade_market(m)]
-        
-        # Generate signals and sort by edge
-        signals = []
-        for market in suitable:
-            signal = self.generate_signal(market)
-            if signal:
-                signals.append(signal)
+
+        # Vectorized prefilter: one mask over liquidity/price/expiry
+        # arrays replaces ~200 should_trade_market calls, each of which
+        # parsed end_date and asked for the current time
+        suitable = []
+        if markets:
+            n = len(markets)
+            liq = np.fromiter((m.liquidity for m in markets), dtype=np.float64, count=n)
+            yes = np.fromiter((m.yes_price for m in markets), dtype=np.float64, count=n)
+            ends = np.fromiter((_end_timestamp(m.end_date) for m in markets), dtype=np.float64, count=n)
+
+            now_ts = datetime.now(timezone.utc).timestamp()
+            days = np.maximum((ends - now_ts) / 86400.0, 0.0)
+
+            # HARD 7-DAY FILTER (NaN end dates fail the comparison)
+            keep = (liq >= 50000) & (yes > 0.02) & (yes < 0.98) & (days <= 7)
+            suitable = [(markets[i], float(days[i])) for i in np.nonzero(keep)[0]]
+
+        # Generate signals and sort by edge; one shared timestamp for
+        # the whole cycle instead of a datetime per signal
+        # (time.strftime skips the datetime object entirely)
+        now_iso = time.strftime('%Y-%m-%dT%H:%M:%S')
+        if self.parallel and len(suitable) >= 8:
+            # Markets are independent, so fan the estimator-heavy work
+            # out across cores; each worker keeps its own estimator
+            payloads = [
+                (self.bankroll, self.min_edge, market, market_days, now_iso)
+                for market, market_days in suitable
+            ]
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+                signals = [
+                    s for s in ex.map(_generate_signal_in_worker, payloads, chunksize=8)
+                    if s
+                ]
+        else:
+            signals = []
+            for market, market_days in suitable:
+                signal = self.generate_signal(market, days=market_days, now_iso=now_iso)
+                if signal:
+                    signals.append(signal)
         
-        # Sort by edge (highest first)
-        signals.sort(key=lambda x: abs(x['edge']), reverse=True)
+        # Sort by edge (highest first); for larger batches np.argsort on
+        # a precomputed |edge| array beats per-element lambda dispatch
+        if len(signals) < 32:
+            signals.sort(key=lambda x: abs(x['edge']), reverse=True)
+        else:
+            edges = np.fromiter(
+                (abs(s['edge']) for s in signals),
+                dtype=np.float64, count=len(signals)
+            )
+            signals = [signals[i] for i in np.argsort(-edges, kind='stable')]
         
         # Allocate capital
         allocated = []
@@ -177,29 +318,32 @@ class StrategyASignalGenerator:
             available_capital -= position_size
             allocated.append(signal)
         
-        # Save to database
-        saved_count = 0
-        for signal in allocated:
+        # Save to database in one transaction; fall back to per-signal
+        # saves only if the batch fails, so one bad row can't drop the rest
+        if allocated:
             try:
-                self.db.save_trade(signal)
-                saved_count += 1
+                self.db.save_trades_many(allocated)
             except Exception as e:
-                print(f"[{self.STRATEGY_NAME}] Error saving: {e}")
+                print(f"[{self.STRATEGY_NAME}] Batch save failed ({e}), retrying individually")
+                for signal in allocated:
+                    try:
+                        self.db.save_trade(signal)
+                    except Exception as e:
+                        print(f"[{self.STRATEGY_NAME}] Error saving: {e}")
         
         return allocated
     
     def run_cycle(self):
         """Run one complete trading cycle."""
-        open_trades = self.db.get_open_trades()
+        open_trades, exposure = self._snapshot_state()
         closed_trades = self.db.get_closed_trades()
-        exposure = self.get_current_exposure()
         available = self.bankroll - exposure
         
         print(f"\n[{self.STRATEGY_NAME}] Cycle Start")
         print(f"  Open: {len(open_trades)} | Closed: {len(closed_trades)}")
         print(f"  Exposure: ${exposure:.2f} | Available: ${available:.2f}")
         
-        signals = self.generate_signals()
+        signals = self.generate_signals(exposure=exposure)
         
         print(f"  New signals: {len(signals)}")
         print(f"[{self.STRATEGY_NAME}] Cycle Complete\n")
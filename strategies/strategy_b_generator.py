@@ -4,16 +4,59 @@ Uses enhanced multipliers to prioritize short-term markets
 while still allowing longer-term opportunities.
 """
 
-import sys
-sys.path.insert(0, '/home/eduardoneville/projects/polymarket-trader')
+from __future__ import annotations
 
+import calendar
+import threading
+import time
+
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from utils.paper_trading_db import PaperTradingDB
 from utils.take_profit_calculator import calculate_take_profit, calculate_stop_loss
-from models.edge_estimator import EnsembleEdgeEstimator
-from strategies.adaptive_kelly import AdaptiveKelly
-from scanner import PolymarketScanner, Market
+from strategies._kernels import score_batch, time_multiplier as _time_multiplier
+from strategies._signal import Signal
+
+if TYPE_CHECKING:
+    from scanner import Market
+
+
+
+# Parsed end_date cache shared across scan cycles - the same ISO strings
+# come back every fetch, so each is parsed once instead of per cycle
+_END_TS_CACHE: Dict[str, float] = {}
+
+
+def _end_timestamp(end_date: str) -> float:
+    """Epoch seconds for an ISO end date; NaN if missing or unparseable."""
+    if not end_date:
+        return float('nan')
+
+    ts = _END_TS_CACHE.get(end_date)
+    if ts is None:
+        # Polymarket dates arrive in the fixed shape
+        # YYYY-MM-DDTHH:MM:SS[.fff]Z - slice-to-int plus timegm skips
+        # fromisoformat and the replace() allocation; anything else
+        # falls back to the general parser
+        if end_date.endswith(('Z', '+00:00')) and len(end_date) >= 20:
+            try:
+                ts = float(calendar.timegm((
+                    int(end_date[0:4]), int(end_date[5:7]), int(end_date[8:10]),
+                    int(end_date[11:13]), int(end_date[14:16]), int(end_date[17:19]),
+                    0, 0, 0
+                )))
+            except ValueError:
+                ts = None
+        if ts is None:
+            try:
+                ts = datetime.fromisoformat(end_date.replace('Z', '+00:00')).timestamp()
+            except (ValueError, TypeError):
+                ts = float('nan')
+        _END_TS_CACHE[end_date] = ts
+    return ts
 
 
 class StrategyBSignalGenerator:
@@ -25,26 +68,41 @@ class StrategyBSignalGenerator:
     STRATEGY_NAME = "Strategy_B_Multipliers"
     DB_PATH = "data/paper_trading_strategy_b.db"
     
-    def __init__(self, bankroll: float = 1000, min_edge: float = 0.05):
+    def __init__(self, bankroll: float = 1000, min_edge: float = 0.05, parallel: bool = False):
         self.bankroll = bankroll
         self.min_edge = min_edge
+        self.parallel = parallel
+        # Heavy dependencies imported on first construction, so merely
+        # importing this module (e.g. from a scheduler that loads every
+        # strategy) doesn't pull in the scanner and estimator stacks
+        from models.edge_estimator import EnsembleEdgeEstimator
+        from strategies.adaptive_kelly import AdaptiveKelly
+        from scanner import get_shared_scanner
+        
         self.db = PaperTradingDB(db_path=self.DB_PATH)
         self.estimator = EnsembleEdgeEstimator()
         self.kelly = AdaptiveKelly()
-        self.scanner = PolymarketScanner()
+        self.scanner = get_shared_scanner()
+        # Per-cycle estimate memo keyed by (slug, price): the ensemble
+        # estimate dominates per-market cost, so never pay it twice for
+        # the same market at the same price within a cycle
+        self._est_cache: Dict = {}
+        self._est_lock = threading.Lock()
     
-    def calculate_time_to_resolution(self, market: Market) -> Optional[float]:
-        """Calculate days until market resolution."""
-        if not market.end_date:
-            return None
-        
-        try:
-            end = datetime.fromisoformat(market.end_date.replace('Z', '+00:00'))
-            now = datetime.now(timezone.utc)
-            delta = end - now
-            return max(0, delta.days + delta.seconds / 86400)
-        except (ValueError, TypeError):
+    def calculate_time_to_resolution(self, market: Market, now_ts: Optional[float] = None) -> Optional[float]:
+        """Calculate days until market resolution.
+
+        Uses the cached epoch parser - this runs at least twice per
+        market per cycle, and float arithmetic on epoch seconds avoids
+        re-parsing the string and allocating datetime objects each time.
+        """
+        end_ts = _end_timestamp(market.end_date)
+        if end_ts != end_ts:  # NaN: missing or unparseable end date
             return None
+
+        if now_ts is None:
+            now_ts = time.time()
+        return max(0.0, (end_ts - now_ts) / 86400.0)
     
     def get_time_multiplier(self, days_to_resolve: float) -> float:
         """
@@ -54,16 +112,9 @@ class StrategyBSignalGenerator:
         - 30-90 days: 1.25x (vs current 1.1x)
         - >90 days: 0.5x (PENALTY - reduce priority)
         """
-        if days_to_resolve < 7:
-            return 3.0  # +100% vs current
-        elif days_to_resolve < 30:
-            return 2.0  # +60% vs current
-        elif days_to_resolve < 90:
-            return 1.25  # +14% vs current
-        else:
-            return 0.5  # PENALTY - demote long-term markets
+        return float(_time_multiplier(days_to_resolve))
     
-    def should_trade_market(self, market: Market) -> bool:
+    def should_trade_market(self, market: Market, days: Optional[float] = None) -> bool:
         """Basic filters - allow all timeframes but with scoring."""
         if market.liquidity < 50000:
             return False
@@ -75,22 +126,29 @@ class StrategyBSignalGenerator:
             return False
         
         # Allow all timeframes up to 2 years
-        days = self.calculate_time_to_resolution(market)
+        if days is None:
+            days = self.calculate_time_to_resolution(market)
         if days is None or days > 365 * 2:
             return False
         
         return True
     
-    def generate_signal(self, market: Market) -> Optional[Dict]:
+    def generate_signal(self, market: Market, days: Optional[float] = None,
+                        now_iso: Optional[str] = None) -> Optional[Signal]:
         """Generate trading signal for a market."""
-        self.estimator.update_price(market.slug, market.yes_price)
-        
-        estimate = self.estimator.estimate_probability(
-            market_slug=market.slug,
-            market_question=market.question,
-            current_price=market.yes_price,
-            category=market.category
-        )
+        key = (market.slug, round(market.yes_price, 4))
+        with self._est_lock:
+            estimate = self._est_cache.get(key)
+        if estimate is None:
+            self.estimator.update_price(market.slug, market.yes_price)
+            estimate = self.estimator.estimate_probability(
+                market_slug=market.slug,
+                market_question=market.question,
+                current_price=market.yes_price,
+                category=market.category
+            )
+            with self._est_lock:
+                self._est_cache[key] = estimate
         
         if abs(estimate.edge) < self.min_edge:
             return None
@@ -119,41 +177,40 @@ class StrategyBSignalGenerator:
             risk_pct=0.50
         )
         
-        days = self.calculate_time_to_resolution(market)
+        if days is None:
+            days = self.calculate_time_to_resolution(market)
         time_multiplier = self.get_time_multiplier(days)
         priority_score = abs(estimate.edge) * time_multiplier
         
-        signal = {
-            'timestamp': datetime.now().isoformat(),
-            'market_slug': market.slug,
-            'market_question': market.question,
-            'intended_side': kelly_result.side,
-            'intended_price': market.yes_price,
-            'intended_size': kelly_result.position_size,
-            'estimated_prob': estimate.ensemble_probability,
-            'market_price': market.yes_price,
-            'edge': estimate.edge,
-            'confidence': estimate.confidence,
-            'strategy': self.STRATEGY_NAME,
-            'recommendation': estimate.recommendation,
-            'take_profit_price': tp_level.target_price if tp_level else None,
-            'take_profit_pct': tp_level.target_pct_move if tp_level else None,
-            'stop_loss_price': sl_level.stop_price if sl_level else None,
-            'stop_loss_pct': sl_level.stop_pct_move if sl_level else None,
-            'days_to_resolve': days,
-            'resolution_date': market.end_date,
-            'time_multiplier': time_multiplier,
-            'priority_score': priority_score,
-        }
-        
-        return signal
+        return Signal(
+            timestamp=now_iso if now_iso is not None else datetime.now().isoformat(),
+            market_slug=market.slug,
+            market_question=market.question,
+            intended_side=kelly_result.side,
+            intended_price=market.yes_price,
+            intended_size=kelly_result.position_size,
+            estimated_prob=estimate.ensemble_probability,
+            market_price=market.yes_price,
+            edge=estimate.edge,
+            confidence=estimate.confidence,
+            strategy=self.STRATEGY_NAME,
+            recommendation=estimate.recommendation,
+            take_profit_price=tp_level.target_price if tp_level else None,
+            take_profit_pct=tp_level.target_pct_move if tp_level else None,
+            stop_loss_price=sl_level.stop_price if sl_level else None,
+            stop_loss_pct=sl_level.stop_pct_move if sl_level else None,
+            days_to_resolve=days,
+            resolution_date=market.end_date,
+            time_multiplier=time_multiplier,
+            priority_score=priority_score,
+        )
     
     def get_current_exposure(self) -> float:
-        """Get total exposure from open trades."""
-        open_trades = self.db.get_open_trades()
-        return sum(t.get('intended_size', 0) for t in open_trades)
+        """Get total exposure from open trades (summed in SQLite)."""
+        return self.db.get_open_exposure()
     
-    def generate_signals(self, max_markets: int = 100) -> List[Dict]:
+    def generate_signals(self, max_markets: int = 100,
+                         markets: Optional[List[Market]] = None) -> List[Signal]:
         """Generate signals for Strategy B."""
         current_exposure = self.get_current_exposure()
         available_capital = self.bankroll - current_exposure
@@ -163,41 +220,89 @@ class StrategyBSignalGenerator:
             print(f"[{self.STRATEGY_NAME}] Insufficient capital: ${available_capital:.2f}")
             return []
         
-        markets = self.scanner.get_active_markets(limit=300)
-        suitable = [m for m in markets if self.should_trade_market(m)]
+        self._est_cache.clear()
+        if markets is None:
+            markets = self.scanner.get_active_markets(limit=300)
+
+        # Vectorized prefilter: one mask over liquidity/price/expiry
+        # arrays replaces a should_trade_market call per market
+        suitable = []
+        if markets:
+            n = len(markets)
+            liq = np.fromiter((m.liquidity for m in markets), dtype=np.float64, count=n)
+            yes = np.fromiter((m.yes_price for m in markets), dtype=np.float64, count=n)
+            ends = np.fromiter((_end_timestamp(m.end_date) for m in markets), dtype=np.float64, count=n)
+
+            now_ts = time.time()
+            days = np.maximum((ends - now_ts) / 86400.0, 0.0)
+
+            # Up to 2 years out (NaN end dates fail the comparison)
+            keep = (liq >= 50000) & (yes > 0.02) & (yes < 0.98) & (days <= 365 * 2)
+            suitable = [(markets[i], float(days[i])) for i in np.nonzero(keep)[0]]
+        
+        # One wall-clock read and format for the whole cycle instead of
+        # one per signal
+        now_iso = time.strftime('%Y-%m-%dT%H:%M:%S')
         
-        # Generate signals with scoring
-        scored_signals = []
-        for market in suitable:
-            signal = self.generate_signal(market)
-            if signal:
-                scored_signals.append((signal['priority_score'], signal))
+        # Generate signals with scoring; the estimate per market is
+        # independent, so optionally fan out over a thread pool (the
+        # estimator and memo are lock-guarded for this)
+        if self.parallel and len(suitable) >= 8:
+            with ThreadPoolExecutor(max_workers=min(16, len(suitable))) as pool:
+                signals = [
+                    s for s in pool.map(
+                        lambda item: self.generate_signal(item[0], days=item[1], now_iso=now_iso),
+                        suitable
+                    ) if s
+                ]
+        else:
+            signals = []
+            for market, market_days in suitable:
+                signal = self.generate_signal(market, days=market_days, now_iso=now_iso)
+                if signal:
+                    signals.append(signal)
         
-        # Sort by priority score (highest first)
-        scored_signals.sort(reverse=True, key=lambda x: x[0])
+        # Score and order in one compiled pass (highest first); when
+        # only the top max_markets matter, argpartition does a partial
+        # selection instead of fully sorting the rest
+        if signals:
+            m = len(signals)
+            sig_days = np.fromiter((s.days_to_resolve for s in signals), dtype=np.float64, count=m)
+            sig_edges = np.fromiter((s.edge for s in signals), dtype=np.float64, count=m)
+            scores = score_batch(sig_days, sig_edges)
+            if m > max_markets:
+                top = np.argpartition(-scores, max_markets - 1)[:max_markets]
+                order = top[np.argsort(-scores[top], kind='stable')]
+            else:
+                order = np.argsort(-scores, kind='stable')
+            signals = [signals[i] for i in order]
         
         # Allocate capital
         allocated = []
-        for score, signal in scored_signals[:max_markets]:
+        for signal in signals[:max_markets]:
             if available_capital < MIN_TRADE_SIZE:
                 break
             
-            position_size = min(signal['intended_size'], available_capital)
+            position_size = min(signal.intended_size, available_capital)
             if position_size < MIN_TRADE_SIZE:
                 continue
             
-            signal['intended_size'] = position_size
+            signal.intended_size = position_size
             available_capital -= position_size
             allocated.append(signal)
         
-        # Save to database
-        saved_count = 0
-        for signal in allocated:
+        # Save to database in one transaction; fall back to per-signal
+        # saves only if the batch fails, so one bad row can't drop the rest
+        if allocated:
             try:
-                self.db.save_trade(signal)
-                saved_count += 1
+                self.db.save_trades_many([s.to_trade() for s in allocated])
             except Exception as e:
-                print(f"[{self.STRATEGY_NAME}] Error saving: {e}")
+                print(f"[{self.STRATEGY_NAME}] Batch save failed ({e}), retrying individually")
+                for signal in allocated:
+                    try:
+                        self.db.save_trade(signal.to_trade())
+                    except Exception as e:
+                        print(f"[{self.STRATEGY_NAME}] Error saving: {e}")
         
         return allocated
     
@@ -214,19 +319,15 @@ class StrategyBSignalGenerator:
         
         signals = self.generate_signals()
         
-        # Show time distribution
+        # Show time distribution (branchless bucket histogram)
         if signals:
-            buckets = {'<7d': 0, '7-30d': 0, '30-90d': 0, '>90d': 0}
-            for s in signals:
-                days = s.get('days_to_resolve', 999)
-                if days < 7:
-                    buckets['<7d'] += 1
-                elif days < 30:
-                    buckets['7-30d'] += 1
-                elif days < 90:
-                    buckets['30-90d'] += 1
-                else:
-                    buckets['>90d'] += 1
+            days = np.fromiter(
+                (s.days_to_resolve if s.days_to_resolve is not None else 999
+                 for s in signals),
+                dtype=np.float64, count=len(signals)
+            )
+            counts = np.bincount(np.digitize(days, [7, 30, 90]), minlength=4)
+            buckets = dict(zip(['<7d', '7-30d', '30-90d', '>90d'], counts.tolist()))
             print(f"  Time distribution: {buckets}")
         
         print(f"  New signals: {len(signals)}")
@@ -248,9 +349,8 @@ if __name__ == "__main__":
     if signals:
         print(f"\nGenerated {len(signals)} signals")
         for s in signals[:5]:
-            mult = s['time_multiplier']
-            print(f"  - {s['market_question'][:45]}")
-            print(f"    Edge: {s['edge']:.1%} | Days: {s['days_to_resolve']:.0f} | "
-                  f"Mult: {mult:.1f}x | Score: {s['priority_score']:.3f}")
+            print(f"  - {s.market_question[:45]}")
+            print(f"    Edge: {s.edge:.1%} | Days: {s.days_to_resolve:.0f} | "
+                  f"Mult: {s.time_multiplier:.1f}x | Score: {s.priority_score:.3f}")
     else:
         print("\nNo signals generated (no suitable markets or capital)")
@@ -6,16 +6,61 @@ Strict tiers with capital allocation limits:
 - Tier 3 (>90 days): Exception only (>15% edge), 10% max single position
 """
 
-import sys
-sys.path.insert(0, '/home/eduardoneville/projects/polymarket-trader')
+from __future__ import annotations
 
+import calendar
+import heapq
+import threading
+import time
+
+from operator import attrgetter
+
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from utils.paper_trading_db import PaperTradingDB
 from utils.take_profit_calculator import calculate_take_profit, calculate_stop_loss
-from models.edge_estimator import EnsembleEdgeEstimator
-from strategies.adaptive_kelly import AdaptiveKelly
-from scanner import PolymarketScanner, Market
+from strategies._signal import Signal
+
+if TYPE_CHECKING:
+    from scanner import Market
+
+
+
+# Parsed end_date cache shared across scan cycles - the same ISO strings
+# come back every fetch, so each is parsed once instead of per cycle
+_END_TS_CACHE: Dict[str, float] = {}
+
+
+def _end_timestamp(end_date: str) -> float:
+    """Epoch seconds for an ISO end date; NaN if missing or unparseable."""
+    if not end_date:
+        return float('nan')
+
+    ts = _END_TS_CACHE.get(end_date)
+    if ts is None:
+        # Polymarket dates arrive in the fixed shape
+        # YYYY-MM-DDTHH:MM:SS[.fff]Z - slice-to-int plus timegm skips
+        # fromisoformat and the replace() allocation; anything else
+        # falls back to the general parser
+        if end_date.endswith(('Z', '+00:00')) and len(end_date) >= 20:
+            try:
+                ts = float(calendar.timegm((
+                    int(end_date[0:4]), int(end_date[5:7]), int(end_date[8:10]),
+                    int(end_date[11:13]), int(end_date[14:16]), int(end_date[17:19]),
+                    0, 0, 0
+                )))
+            except ValueError:
+                ts = None
+        if ts is None:
+            try:
+                ts = datetime.fromisoformat(end_date.replace('Z', '+00:00')).timestamp()
+            except (ValueError, TypeError):
+                ts = float('nan')
+        _END_TS_CACHE[end_date] = ts
+    return ts
 
 
 class StrategyCSignalGenerator:
@@ -27,65 +72,97 @@ class StrategyCSignalGenerator:
     STRATEGY_NAME = "Strategy_C_Tiered"
     DB_PATH = "data/paper_trading_strategy_c.db"
     
-    # Tier Configuration
-    TIER_LIMITS = {
-        'tier1': {'max_pct': 0.70, 'multiplier': 2.5, 'min_edge': 0.05, 'max_days': 30},
-        'tier2': {'max_pct': 0.30, 'multiplier': 1.0, 'min_edge': 0.07, 'max_days': 90},
-        'tier3': {'max_pct': 0.10, 'multiplier': 0.5, 'min_edge': 0.15, 'max_days': float('inf')},
-    }
+    # Tier configuration as compact per-tier tuples
+    # (max_pct, multiplier, min_edge, max_days), indexed by assign_tier;
+    # tuple indexing on the hot path replaces nested dict lookups
+    TIER_NAMES = ('tier1', 'tier2', 'tier3')
+    TIER_CFG = (
+        (0.70, 2.5, 0.05, 30),
+        (0.30, 1.0, 0.07, 90),
+        (0.10, 0.5, 0.15, float('inf')),
+    )
     
-    def __init__(self, bankroll: float = 1000):
+    def __init__(self, bankroll: float = 1000, parallel: bool = False):
         self.bankroll = bankroll
+        self.parallel = parallel
+        # Heavy dependencies imported on first construction, so merely
+        # importing this module (e.g. from a scheduler that loads every
+        # strategy) doesn't pull in the scanner and estimator stacks
+        from models.edge_estimator import EnsembleEdgeEstimator
+        from strategies.adaptive_kelly import AdaptiveKelly
+        from scanner import get_shared_scanner
+        
         self.db = PaperTradingDB(db_path=self.DB_PATH)
         self.estimator = EnsembleEdgeEstimator()
         self.kelly = AdaptiveKelly()
-        self.scanner = PolymarketScanner()
+        self.scanner = get_shared_scanner()
+        # Per-cycle estimate memo keyed by (slug, price): the ensemble
+        # estimate dominates per-market cost, so never pay it twice for
+        # the same market at the same price within a cycle
+        self._est_cache: Dict = {}
+        self._est_lock = threading.Lock()
     
-    def calculate_time_to_resolution(self, market: Market) -> Optional[float]:
-        """Calculate days until market resolution."""
-        if not market.end_date:
-            return None
-        
-        try:
-            end = datetime.fromisoformat(market.end_date.replace('Z', '+00:00'))
-            now = datetime.now(timezone.utc)
-            delta = end - now
-            return max(0, delta.days + delta.seconds / 86400)
-        except (ValueError, TypeError):
+    def calculate_time_to_resolution(self, market: Market, now_ts: Optional[float] = None) -> Optional[float]:
+        """Calculate days until market resolution.
+
+        Uses the cached epoch parser - this runs at least twice per
+        market per cycle, and float arithmetic on epoch seconds avoids
+        re-parsing the string and allocating datetime objects each time.
+        """
+        end_ts = _end_timestamp(market.end_date)
+        if end_ts != end_ts:  # NaN: missing or unparseable end date
             return None
+
+        if now_ts is None:
+            now_ts = time.time()
+        return max(0.0, (end_ts - now_ts) / 86400.0)
     
-    def assign_tier(self, days_to_resolve: float) -> str:
-        """Assign market to tier based on resolution time."""
+    def assign_tier(self, days_to_resolve: float) -> int:
+        """Assign market to a tier index (0/1/2) based on resolution time."""
         if days_to_resolve < 30:
-            return 'tier1'
+            return 0
         elif days_to_resolve < 90:
-            return 'tier2'
+            return 1
         else:
-            return 'tier3'
+            return 2
     
+    def _tier_exposures(self, open_trades: Optional[List[Dict]] = None) -> Dict[str, float]:
+        """Bucket open-trade exposure by tier in one pass.
+        
+        Without rows in hand this pushes the grouping down to SQLite;
+        callers that already fetched open trades can pass them to avoid
+        a second query.
+        """
+        if open_trades is None:
+            return self.db.get_open_exposure_by_tier()
+
+        exposures = {'tier1': 0.0, 'tier2': 0.0, 'tier3': 0.0}
+        for t in open_trades:
+            tier = self.assign_tier(t.get('days_to_resolve', 999))
+            exposures[self.TIER_NAMES[tier]] += t.get('intended_size', 0)
+        return exposures
+
     def get_tier_exposure(self, tier: str) -> float:
         """Get current exposure for a specific tier."""
-        open_trades = self.db.get_open_trades()
-        total = 0
-        for t in open_trades:
-            days = t.get('days_to_resolve', 999)
-            trade_tier = self.assign_tier(days)
-            if trade_tier == tier:
-                total += t.get('intended_size', 0)
-        return total
+        return self._tier_exposures()[tier]
     
-    def can_allocate_to_tier(self, tier: str, amount: float) -> Tuple[bool, str]:
-        """Check if we can allocate more capital to a tier."""
+    def can_allocate_to_tier(self, tier: str, amount: float) -> Tuple[bool, str, float]:
+        """Check if we can allocate more capital to a tier.
+        
+        Returns (ok, reason, remaining) so callers handling a rejection
+        can size down against the returned headroom instead of hitting
+        the database again.
+        """
         current = self.get_tier_exposure(tier)
-        max_allowed = self.bankroll * self.TIER_LIMITS[tier]['max_pct']
+        max_allowed = self.bankroll * self.TIER_CFG[self.TIER_NAMES.index(tier)][0]
+        remaining = max_allowed - current
         
         if current + amount > max_allowed:
-            remaining = max_allowed - current
-            return False, f"Tier {tier} limit reached (${remaining:.2f} remaining)"
+            return False, f"Tier {tier} limit reached (${remaining:.2f} remaining)", remaining
         
-        return True, "OK"
+        return True, "OK", remaining
     
-    def should_trade_market(self, market: Market) -> bool:
+    def should_trade_market(self, market: Market, days: Optional[float] = None) -> bool:
         """Basic filters."""
         if market.liquidity < 50000:
             return False
@@ -96,29 +173,49 @@ class StrategyCSignalGenerator:
         if not market.end_date:
             return False
         
-        days = self.calculate_time_to_resolution(market)
+        if days is None:
+            days = self.calculate_time_to_resolution(market)
         if days is None or days > 365 * 2:
             return False
         
         return True
     
-    def generate_signal(self, market: Market) -> Optional[Dict]:
+    def generate_signal(self, market: Market, days: Optional[float] = None,
+                        tier: Optional[int] = None,
+                        now_iso: Optional[str] = None) -> Optional[Signal]:
         """Generate trading signal with tier assignment."""
-        days = self.calculate_time_to_resolution(market)
-        tier = self.assign_tier(days)
-        tier_config = self.TIER_LIMITS[tier]
+        if days is None:
+            days = self.calculate_time_to_resolution(market)
+        if tier is None:
+            tier = self.assign_tier(days)
+        _, tier_mult, tier_min_edge, _ = self.TIER_CFG[tier]
         
-        self.estimator.update_price(market.slug, market.yes_price)
-        
-        estimate = self.estimator.estimate_probability(
-            market_slug=market.slug,
-            market_question=market.question,
-            current_price=market.yes_price,
-            category=market.category
+        # Cheap prefilter: when the price sits close to the category
+        # base rate, an edge clearing this tier's minimum is unlikely,
+        # so skip the expensive ensemble estimate entirely
+        rough_edge = abs(
+            self.estimator.cheap_prior(market.slug, market.category, market.yes_price)
+            - market.yes_price
         )
+        if rough_edge < 0.5 * tier_min_edge:
+            return None
+        
+        key = (market.slug, round(market.yes_price, 4))
+        with self._est_lock:
+            estimate = self._est_cache.get(key)
+        if estimate is None:
+            self.estimator.update_price(market.slug, market.yes_price)
+            estimate = self.estimator.estimate_probability(
+                market_slug=market.slug,
+                market_question=market.question,
+                current_price=market.yes_price,
+                category=market.category
+            )
+            with self._est_lock:
+                self._est_cache[key] = estimate
         
         # Check tier-specific minimum edge
-        if abs(estimate.edge) < tier_config['min_edge']:
+        if abs(estimate.edge) < tier_min_edge:
             return None
         
         kelly_result = self.kelly.calculate_position_size(
@@ -136,7 +233,7 @@ class StrategyCSignalGenerator:
             estimated_prob=estimate.ensemble_probability,
             side=kelly_result.side,
             edge_capture_ratio=0.75,
-            min_edge_threshold=tier_config['min_edge']
+            min_edge_threshold=tier_min_edge
         )
         
         sl_level = calculate_stop_loss(
@@ -145,43 +242,45 @@ class StrategyCSignalGenerator:
             risk_pct=0.50
         )
         
-        priority_score = abs(estimate.edge) * tier_config['multiplier']
-        
-        signal = {
-            'timestamp': datetime.now().isoformat(),
-            'market_slug': market.slug,
-            'market_question': market.question,
-            'intended_side': kelly_result.side,
-            'intended_price': market.yes_price,
-            'intended_size': kelly_result.position_size,
-            'estimated_prob': estimate.ensemble_probability,
-            'market_price': market.yes_price,
-            'edge': estimate.edge,
-            'confidence': estimate.confidence,
-            'strategy': self.STRATEGY_NAME,
-            'recommendation': estimate.recommendation,
-            'take_profit_price': tp_level.target_price if tp_level else None,
-            'take_profit_pct': tp_level.target_pct_move if tp_level else None,
-            'stop_loss_price': sl_level.stop_price if sl_level else None,
-            'stop_loss_pct': sl_level.stop_pct_move if sl_level else None,
-            'days_to_resolve': days,
-            'resolution_date': market.end_date,
-            'tier': tier,
-            'tier_multiplier': tier_config['multiplier'],
-            'tier_min_edge': tier_config['min_edge'],
-            'priority_score': priority_score,
-        }
+        priority_score = abs(estimate.edge) * tier_mult
         
-        return signal
+        return Signal(
+            timestamp=now_iso if now_iso is not None else datetime.now().isoformat(),
+            market_slug=market.slug,
+            market_question=market.question,
+            intended_side=kelly_result.side,
+            intended_price=market.yes_price,
+            intended_size=kelly_result.position_size,
+            estimated_prob=estimate.ensemble_probability,
+            market_price=market.yes_price,
+            edge=estimate.edge,
+            confidence=estimate.confidence,
+            strategy=self.STRATEGY_NAME,
+            recommendation=estimate.recommendation,
+            take_profit_price=tp_level.target_price if tp_level else None,
+            take_profit_pct=tp_level.target_pct_move if tp_level else None,
+            stop_loss_price=sl_level.stop_price if sl_level else None,
+            stop_loss_pct=sl_level.stop_pct_move if sl_level else None,
+            days_to_resolve=days,
+            resolution_date=market.end_date,
+            tier=self.TIER_NAMES[tier],
+            tier_multiplier=tier_mult,
+            tier_min_edge=tier_min_edge,
+            priority_score=priority_score,
+        )
     
     def get_current_exposure(self) -> float:
-        """Get total exposure from open trades."""
-        open_trades = self.db.get_open_trades()
-        return sum(t.get('intended_size', 0) for t in open_trades)
+        """Get total exposure from open trades (summed in SQLite)."""
+        return self.db.get_open_exposure()
     
-    def generate_signals(self, max_markets: int = 100) -> List[Dict]:
+    def generate_signals(self, max_markets: int = 100,
+                         markets: Optional[List[Market]] = None) -> List[Signal]:
         """Generate signals with tiered allocation."""
-        current_exposure = self.get_current_exposure()
+        # One aggregated exposure read per cycle: SQLite groups open
+        # trades by tier, and the allocation loop then works against
+        # the in-memory tier totals instead of re-querying per signal
+        tier_exposure = self._tier_exposures()
+        current_exposure = sum(tier_exposure.values())
         available_capital = self.bankroll - current_exposure
         
         MIN_TRADE_SIZE = 20
@@ -189,57 +288,103 @@ class StrategyCSignalGenerator:
             print(f"[{self.STRATEGY_NAME}] Insufficient capital: ${available_capital:.2f}")
             return []
         
-        markets = self.scanner.get_active_markets(limit=300)
-        suitable = [m for m in markets if self.should_trade_market(m)]
+        self._est_cache.clear()
+        if markets is None:
+            markets = self.scanner.get_active_markets(limit=300)
+
+        # Vectorized prefilter: one mask over liquidity/price/expiry
+        # arrays replaces a should_trade_market call per market
+        suitable = []
+        if markets:
+            n = len(markets)
+            liq = np.fromiter((m.liquidity for m in markets), dtype=np.float64, count=n)
+            yes = np.fromiter((m.yes_price for m in markets), dtype=np.float64, count=n)
+            ends = np.fromiter((_end_timestamp(m.end_date) for m in markets), dtype=np.float64, count=n)
+
+            now_ts = time.time()
+            days = np.maximum((ends - now_ts) / 86400.0, 0.0)
+
+            # Up to 2 years out (NaN end dates fail the comparison)
+            keep = (liq >= 50000) & (yes > 0.02) & (yes < 0.98) & (days <= 365 * 2)
+            suitable = [(markets[i], float(days[i]), self.assign_tier(float(days[i])))
+                        for i in np.nonzero(keep)[0]]
+        
+        # One wall-clock read and format for the whole cycle instead of
+        # one per signal
+        now_iso = time.strftime('%Y-%m-%dT%H:%M:%S')
         
-        # Generate all signals with tier info
-        all_signals = []
-        for market in suitable:
-            signal = self.generate_signal(market)
-            if signal:
-                all_signals.append(signal)
+        # Generate all signals with tier info; estimates are independent
+        # per market, so optionally fan out over a thread pool (the
+        # estimator and memo are lock-guarded for this)
+        if self.parallel and len(suitable) >= 8:
+            with ThreadPoolExecutor(max_workers=min(16, len(suitable))) as pool:
+                all_signals = [
+                    s for s in pool.map(
+                        lambda item: self.generate_signal(
+                            item[0], days=item[1], tier=item[2], now_iso=now_iso),
+                        suitable
+                    ) if s
+                ]
+        else:
+            all_signals = []
+            for market, market_days, market_tier in suitable:
+                signal = self.generate_signal(market, days=market_days, tier=market_tier,
+                                              now_iso=now_iso)
+                if signal:
+                    all_signals.append(signal)
         
-        # Sort by priority score (tier-weighted edge)
-        all_signals.sort(key=lambda x: x['priority_score'], reverse=True)
+        # Top-k selection by priority score (tier-weighted edge);
+        # nlargest is O(N log k) vs O(N log N) for a full sort. Keep a
+        # buffer past max_markets since tier limits can reject signals
+        k = min(len(all_signals), max_markets * 3)
+        all_signals = heapq.nlargest(k, all_signals, key=attrgetter('priority_score'))
         
-        # Allocate with tier limits
+        # Allocate with tier limits, tracked in memory as we go
+        max_allowed = {
+            name: self.bankroll * cfg[0]
+            for name, cfg in zip(self.TIER_NAMES, self.TIER_CFG)
+        }
         allocated = []
-        tier_allocations = {'tier1': 0, 'tier2': 0, 'tier3': 0}
         
         for signal in all_signals:
             if available_capital < MIN_TRADE_SIZE:
                 break
             
-            tier = signal['tier']
-            position_size = min(signal['intended_size'], available_capital)
+            tier = signal.tier
+            position_size = min(signal.intended_size, available_capital)
             
             if position_size < MIN_TRADE_SIZE:
                 continue
             
-            # Check tier limit
-            can_allocate, reason = self.can_allocate_to_tier(tier, position_size)
-            if not can_allocate:
+            # Check tier limit against the cycle's running totals
+            if tier_exposure[tier] + position_size > max_allowed[tier]:
                 # Skip if tier full (except tier1 which is priority)
                 if tier != 'tier1':
                     continue
                 # For tier1, try smaller size
-                remaining = (self.bankroll * self.TIER_LIMITS[tier]['max_pct']) - self.get_tier_exposure(tier)
+                remaining = max_allowed[tier] - tier_exposure[tier]
                 if remaining >= MIN_TRADE_SIZE:
                     position_size = min(position_size, remaining)
                 else:
                     continue
             
-            signal['intended_size'] = position_size
+            signal.intended_size = position_size
             available_capital -= position_size
-            tier_allocations[tier] += position_size
+            tier_exposure[tier] += position_size
             allocated.append(signal)
         
-        # Save to database
-        for signal in allocated:
+        # Save to database in one transaction; fall back to per-signal
+        # saves only if the batch fails, so one bad row can't drop the rest
+        if allocated:
             try:
-                self.db.save_trade(signal)
+                self.db.save_trades_many([s.to_trade() for s in allocated])
             except Exception as e:
-                print(f"[{self.STRATEGY_NAME}] Error saving: {e}")
+                print(f"[{self.STRATEGY_NAME}] Batch save failed ({e}), retrying individually")
+                for signal in allocated:
+                    try:
+                        self.db.save_trade(signal.to_trade())
+                    except Exception as e:
+                        print(f"[{self.STRATEGY_NAME}] Error saving: {e}")
         
         return allocated
     
@@ -254,10 +399,9 @@ class StrategyCSignalGenerator:
         print(f"  Open: {len(open_trades)} | Closed: {len(closed_trades)}")
         print(f"  Exposure: ${exposure:.2f} | Available: ${available:.2f}")
         
-        # Show current tier allocation
-        t1 = self.get_tier_exposure('tier1')
-        t2 = self.get_tier_exposure('tier2')
-        t3 = self.get_tier_exposure('tier3')
+        # Show current tier allocation (one grouped query)
+        tiers = self._tier_exposures()
+        t1, t2, t3 = tiers['tier1'], tiers['tier2'], tiers['tier3']
         print(f"  Tier allocation: T1=${t1:.0f} (max ${self.bankroll*0.7:.0f}) | "
               f"T2=${t2:.0f} (max ${self.bankroll*0.3:.0f}) | "
               f"T3=${t3:.0f} (max ${self.bankroll*0.1:.0f})")
@@ -265,9 +409,9 @@ class StrategyCSignalGenerator:
         signals = self.generate_signals()
         
         if signals:
-            new_t1 = sum(1 for s in signals if s['tier'] == 'tier1')
-            new_t2 = sum(1 for s in signals if s['tier'] == 'tier2')
-            new_t3 = sum(1 for s in signals if s['tier'] == 'tier3')
+            new_t1 = sum(1 for s in signals if s.tier == 'tier1')
+            new_t2 = sum(1 for s in signals if s.tier == 'tier2')
+            new_t3 = sum(1 for s in signals if s.tier == 'tier3')
             print(f"  New signals by tier: T1={new_t1}, T2={new_t2}, T3={new_t3}")
         
         print(f"  Total new signals: {len(signals)}")
@@ -291,9 +435,8 @@ if __name__ == "__main__":
     if signals:
         print(f"\nGenerated {len(signals)} signals")
         for s in signals[:5]:
-            tier = s['tier']
-            print(f"  - {s['market_question'][:40]}")
-            print(f"    Tier {tier} | Edge: {s['edge']:.1%} (min {s['tier_min_edge']:.0%}) | "
-                  f"Days: {s['days_to_resolve']:.0f}")
+            print(f"  - {s.market_question[:40]}")
+            print(f"    Tier {s.tier} | Edge: {s.edge:.1%} (min {s.tier_min_edge:.0%}) | "
+                  f"Days: {s.days_to_resolve:.0f}")
     else:
         print("\nNo signals generated (no suitable markets or capital)")
@@ -7,16 +7,35 @@ Tracks and compares performance of all 3 paper trading strategies
 import sys
 sys.path.insert(0, '/home/eduardoneville/projects/polymarket-trader')
 
+import functools
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 
 from utils.paper_trading_db import PaperTradingDB
 
+# orjson serializes dataclasses natively and writes bytes directly -
+# optional, stdlib json remains the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+@functools.lru_cache(maxsize=None)
+def _get_db(db_path: str) -> PaperTradingDB:
+    """One PaperTradingDB per path - schema checks and migrations run
+    once per report process instead of once per metrics call."""
+    return PaperTradingDB(db_path=db_path)
+
+
+# frozen+slots: no per-instance __dict__, and immutability makes the
+# instances safe to hand out from the mtime cache
+@dataclass(frozen=True, slots=True)
 class StrategyMetrics:
     """Metrics for a single strategy"""
     name: str
@@ -40,58 +59,110 @@ class StrategyMetrics:
     resolution_pnl: float
     avg_position_size: float
     capital_turnover: float
+    min_holding_days: Optional[float] = None
+    max_holding_days: Optional[float] = None
+
+    @classmethod
+    def zeros(cls, name: str, db_path: str, bankroll: float) -> 'StrategyMetrics':
+        """Empty-strategy metrics - no DB file or no trades yet"""
+        return cls(
+            name=name,
+            db_path=db_path,
+            bankroll=bankroll,
+            open_trades=0,
+            closed_trades=0,
+            exposure=0.0,
+            available=bankroll,
+            avg_edge=0.0,
+            avg_holding_days=None,
+            total_pnl=0.0,
+            win_rate=0.0,
+            win_count=0,
+            loss_count=0,
+            tp_exits=0,
+            sl_exits=0,
+            resolution_exits=0,
+            tp_pnl=0.0,
+            sl_pnl=0.0,
+            resolution_pnl=0.0,
+            avg_position_size=0.0,
+            capital_turnover=0.0
+        )
     
 
+# Field names resolved once - StrategyMetrics is flat, so a plain
+# getattr dict beats asdict's recursive introspection per export
+_FIELDS = tuple(f.name for f in fields(StrategyMetrics))
+
+
+# Metrics memoized per (path, mtime, bankroll) - dashboards refresh far
+# more often than the trading DBs change, so unchanged DBs skip the
+# aggregation queries entirely
+_metrics_cache: Dict[Tuple[str, int, float], StrategyMetrics] = {}
+
+
 def calculate_strategy_metrics(name: str, db_path: str, bankroll: float = 1000) -> StrategyMetrics:
     """Calculate all metrics for a strategy"""
-    db = PaperTradingDB(db_path=db_path)
-    
-    open_trades = db.get_open_trades()
-    closed_trades = db.get_closed_trades()
-    
-    exposure = sum(t.get('intended_size', 0) for t in open_trades)
-    available = bankroll - exposure
-    
-    # Calculate edge stats
-    edges = [t.get('edge', 0) for t in open_trades + closed_trades]
-    avg_edge = sum(edges) / len(edges) if edges else 0
-    
-    # Calculate holding days
-    holding_days = []
-    for t in closed_trades:
-        if t.get('holding_days') is not None:
-            holding_days.append(t['holding_days'])
-    avg_holding_days = sum(holding_days) / len(holding_days) if holding_days else None
-    
-    # Calculate P&L and win rate
-    total_pnl = sum(t.get('pnl', 0) for t in closed_trades)
-    win_count = sum(1 for t in closed_trades if t.get('pnl', 0) > 0)
-    loss_count = sum(1 for t in closed_trades if t.get('pnl', 0) <= 0)
-    win_rate = win_count / len(closed_trades) if closed_trades else 0
+    try:
+        mtime_ns = os.stat(db_path).st_mtime_ns
+    except OSError:
+        mtime_ns = -1
+    cache_key = (db_path, mtime_ns, bankroll)
+    cached = _metrics_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Fast paths for fresh strategies: a missing DB file (don't create
+    # one just to report on it) or a schema with no trades yet
+    if mtime_ns == -1:
+        metrics = StrategyMetrics.zeros(name, db_path, bankroll)
+        _metrics_cache[cache_key] = metrics
+        return metrics
+
+    db = _get_db(db_path)
+    if not db.has_trades():
+        metrics = StrategyMetrics.zeros(name, db_path, bankroll)
+        _metrics_cache[cache_key] = metrics
+        return metrics
     
-    # Exit breakdown
-    tp_exits = sum(1 for t in closed_trades if t.get('exit_reason') == 'tp')
-    sl_exits = sum(1 for t in closed_trades if t.get('exit_reason') == 'stop_loss')
-    resolution_exits = sum(1 for t in closed_trades if t.get('exit_reason') == 'resolution')
+    # All sums and counts come back as two aggregated rows from SQLite
+    # instead of materializing every trade in Python
+    agg = db.get_strategy_aggregates()
     
-    tp_pnl = sum(t.get('pnl', 0) for t in closed_trades if t.get('exit_reason') == 'tp')
-    sl_pnl = sum(t.get('pnl', 0) for t in closed_trades if t.get('exit_reason') == 'stop_loss')
-    resolution_pnl = sum(t.get('pnl', 0) for t in closed_trades if t.get('exit_reason') == 'resolution')
+    n_open = agg['open_trades']
+    n_closed = agg['closed_trades']
+    n_trades = n_open + n_closed
     
-    # Position size
-    all_sizes = [t.get('intended_size', 0) for t in open_trades + closed_trades]
-    avg_position_size = sum(all_sizes) / len(all_sizes) if all_sizes else 0
+    exposure = agg['open_exposure']
+    available = bankroll - exposure
+    total_traded = agg['closed_size_sum']
     
-    # Capital turnover (total traded / bankroll)
-    total_traded = sum(t.get('intended_size', 0) for t in closed_trades)
+    edge_sum = agg['open_edge_sum'] + agg['closed_edge_sum']
+    avg_edge = edge_sum / n_trades if n_trades else 0
+    avg_holding_days = (
+        agg['holding_days_sum'] / agg['holding_days_count']
+        if agg['holding_days_count'] else None
+    )
+    win_count = agg['win_count']
+    loss_count = agg['loss_count']
+    win_rate = win_count / n_closed if n_closed else 0
+    avg_position_size = (exposure + total_traded) / n_trades if n_trades else 0
     capital_turnover = total_traded / bankroll if bankroll > 0 else 0
     
-    return StrategyMetrics(
+    total_pnl = agg['total_pnl']
+    tp_exits = agg['tp_exits']
+    sl_exits = agg['sl_exits']
+    resolution_exits = agg['resolution_exits']
+    tp_pnl = agg['tp_pnl']
+    sl_pnl = agg['sl_pnl']
+    resolution_pnl = agg['resolution_pnl']
+    
+    metrics = StrategyMetrics(
         name=name,
         db_path=db_path,
         bankroll=bankroll,
-        open_trades=len(open_trades),
-        closed_trades=len(closed_trades),
+        open_trades=n_open,
+        closed_trades=n_closed,
         exposure=exposure,
         available=available,
         avg_edge=avg_edge,
@@ -107,135 +178,176 @@ def calculate_strategy_metrics(name: str, db_path: str, bankroll: float = 1000)
         sl_pnl=sl_pnl,
         resolution_pnl=resolution_pnl,
         avg_position_size=avg_position_size,
-        capital_turnover=capital_turnover
+        capital_turnover=capital_turnover,
+        min_holding_days=agg['holding_days_min'],
+        max_holding_days=agg['holding_days_max']
     )
+    _metrics_cache[cache_key] = metrics
+    return metrics
 
 
-def print_dashboard(metrics_list: List[StrategyMetrics]):
+def print_dashboard(metrics_list: List[StrategyMetrics], now: Optional[datetime] = None):
     """Print formatted dashboard"""
-    print("\n" + "=" * 100)
-    print("📊 STRATEGY COMPARISON DASHBOARD".center(100))
-    print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}".center(100))
-    print("=" * 100)
-    
+    if now is None:
+        now = datetime.now()
+
+    # Buffer the whole dashboard and emit it in one write - dozens of
+    # print() calls mean a syscall each when stdout goes to a pipe or log
+    out = []
+    out.append("\n" + "=" * 100)
+    out.append("📊 STRATEGY COMPARISON DASHBOARD".center(100))
+    out.append(f"Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}".center(100))
+    out.append("=" * 100)
+
     # Portfolio Overview
-    print("\n💰 PORTFOLIO OVERVIEW")
-    print("-" * 100)
-    print(f"{'Strategy':<20} {'Open':>6} {'Closed':>7} {'Exposure':>10} {'Avail':>10} {'Edge':>8}")
-    print("-" * 100)
-    
+    out.append("\n💰 PORTFOLIO OVERVIEW")
+    out.append("-" * 100)
+    out.append(f"{'Strategy':<20} {'Open':>6} {'Closed':>7} {'Exposure':>10} {'Avail':>10} {'Edge':>8}")
+    out.append("-" * 100)
+
     for m in metrics_list:
-        print(f"{m.name:<20} {m.open_trades:>6} {m.closed_trades:>7} "
-              f"${m.exposure:>8.0f} ${m.available:>8.0f} {m.avg_edge:>7.1%}")
-    
+        out.append(f"{m.name:<20} {m.open_trades:>6} {m.closed_trades:>7} "
+                   f"${m.exposure:>8.0f} ${m.available:>8.0f} {m.avg_edge:>7.1%}")
+
     # Performance Metrics
-    print("\n📈 PERFORMANCE METRICS")
-    print("-" * 100)
-    print(f"{'Strategy':<20} {'Trades':>7} {'Win%':>7} {'Wins':>5} {'Loss':>5} "
-          f"{'P&L':>10} {'Avg Pos':>8} {'Turnover':>9}")
-    print("-" * 100)
-    
+    out.append("\n📈 PERFORMANCE METRICS")
+    out.append("-" * 100)
+    out.append(f"{'Strategy':<20} {'Trades':>7} {'Win%':>7} {'Wins':>5} {'Loss':>5} "
+               f"{'P&L':>10} {'Avg Pos':>8} {'Turnover':>9}")
+    out.append("-" * 100)
+
     for m in metrics_list:
         pnl_str = f"${m.total_pnl:+.2f}"
-        print(f"{m.name:<20} {m.closed_trades:>7} {m.win_rate:>7.1%} "
-              f"{m.win_count:>5} {m.loss_count:>5} {pnl_str:>10} "
-              f"${m.avg_position_size:>6.0f} {m.capital_turnover:>8.1f}x")
-    
+        out.append(f"{m.name:<20} {m.closed_trades:>7} {m.win_rate:>7.1%} "
+                   f"{m.win_count:>5} {m.loss_count:>5} {pnl_str:>10} "
+                   f"${m.avg_position_size:>6.0f} {m.capital_turnover:>8.1f}x")
+
     # Exit Analysis
-    print("\n🎯 EXIT ANALYSIS")
-    print("-" * 100)
-    print(f"{'Strategy':<20} {'TP':>5} {'SL':>5} {'Res':>5} {'TP P&L':>10} {'SL P&L':>10} {'Res P&L':>10}")
-    print("-" * 100)
-    
+    out.append("\n🎯 EXIT ANALYSIS")
+    out.append("-" * 100)
+    out.append(f"{'Strategy':<20} {'TP':>5} {'SL':>5} {'Res':>5} {'TP P&L':>10} {'SL P&L':>10} {'Res P&L':>10}")
+    out.append("-" * 100)
+
     for m in metrics_list:
-        print(f"{m.name:<20} {m.tp_exits:>5} {m.sl_exits:>5} {m.resolution_exits:>5} "
-              f"${m.tp_pnl:>+8.2f} ${m.sl_pnl:>+8.2f} ${m.resolution_pnl:>+8.2f}")
-    
+        out.append(f"{m.name:<20} {m.tp_exits:>5} {m.sl_exits:>5} {m.resolution_exits:>5} "
+                   f"${m.tp_pnl:>+8.2f} ${m.sl_pnl:>+8.2f} ${m.resolution_pnl:>+8.2f}")
+
     # Holding Time
-    print("\n⏱️  HOLDING TIME ANALYSIS")
-    print("-" * 100)
-    print(f"{'Strategy':<20} {'Avg Hold':>10} {'Min':>6} {'Max':>6}")
-    print("-" * 100)
-    
+    out.append("\n⏱️  HOLDING TIME ANALYSIS")
+    out.append("-" * 100)
+    out.append(f"{'Strategy':<20} {'Avg Hold':>10} {'Min':>6} {'Max':>6}")
+    out.append("-" * 100)
+
+    # Min/max come from the metrics aggregation - no second DB scan
     for m in metrics_list:
-        db = PaperTradingDB(db_path=m.db_path)
-        closed = db.get_closed_trades()
-        days = [t.get('holding_days') for t in closed if t.get('holding_days') is not None]
-        
         if m.avg_holding_days is not None:
-            print(f"{m.name:<20} {m.avg_holding_days:>9.1f}d {min(days) if days else 0:>5.0f} {max(days) if days else 0:>5.0f}")
+            hold_min = m.min_holding_days if m.min_holding_days is not None else 0
+            hold_max = m.max_holding_days if m.max_holding_days is not None else 0
+            out.append(f"{m.name:<20} {m.avg_holding_days:>9.1f}d {hold_min:>5.0f} {hold_max:>5.0f}")
         else:
-            print(f"{m.name:<20} {'N/A (no closes)':>20}")
-    
+            out.append(f"{m.name:<20} {'N/A (no closes)':>20}")
+
     # Ranking
-    print("\n🏆 STRATEGY RANKINGS")
-    print("-" * 100)
-    
+    out.append("\n🏆 STRATEGY RANKINGS")
+    out.append("-" * 100)
+
     # Rank by P&L
     ranked_by_pnl = sorted(metrics_list, key=lambda x: x.total_pnl, reverse=True)
-    print("\nBy Total P&L:")
+    out.append("\nBy Total P&L:")
     for i, m in enumerate(ranked_by_pnl, 1):
-        print(f"  {i}. {m.name}: ${m.total_pnl:+.2f}")
-    
+        out.append(f"  {i}. {m.name}: ${m.total_pnl:+.2f}")
+
     # Rank by Win Rate (if enough trades)
     with_trades = [m for m in metrics_list if m.closed_trades >= 5]
     if with_trades:
         ranked_by_win = sorted(with_trades, key=lambda x: x.win_rate, reverse=True)
-        print("\nBy Win Rate (min 5 trades):")
+        out.append("\nBy Win Rate (min 5 trades):")
         for i, m in enumerate(ranked_by_win, 1):
-            print(f"  {i}. {m.name}: {m.win_rate:.1%} ({m.win_count}/{m.closed_trades})")
-    
+            out.append(f"  {i}. {m.name}: {m.win_rate:.1%} ({m.win_count}/{m.closed_trades})")
+
     # Rank by Capital Efficiency
     ranked_by_turnover = sorted(metrics_list, key=lambda x: x.capital_turnover, reverse=True)
-    print("\nBy Capital Turnover:")
+    out.append("\nBy Capital Turnover:")
     for i, m in enumerate(ranked_by_turnover, 1):
-        print(f"  {i}. {m.name}: {m.capital_turnover:.2f}x")
-    
-    print("\n" + "=" * 100)
+        out.append(f"  {i}. {m.name}: {m.capital_turnover:.2f}x")
+
+    out.append("\n" + "=" * 100)
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
 
-def export_to_json(metrics_list: List[StrategyMetrics], filepath: str = None):
+def export_to_json(metrics_list: List[StrategyMetrics], filepath: str = None,
+                   now: Optional[datetime] = None):
     """Export metrics to JSON file"""
+    if now is None:
+        now = datetime.now()
     if filepath is None:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         filepath = f"results/strategy_comparison_{timestamp}.json"
-    
+
     Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-    
-    data = {
-        'timestamp': datetime.now().isoformat(),
-        'strategies': [asdict(m) for m in metrics_list]
-    }
-    
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
-    
+
+    # Stream one strategy at a time through a 1MB write buffer - peak
+    # memory stays at a single record instead of the whole document
+    if orjson is not None:
+        # Dataclasses serialize natively; no per-item asdict copies
+        with open(filepath, 'wb', buffering=1 << 20) as f:
+            f.write(b'{"timestamp":' + orjson.dumps(now.isoformat()) + b',"strategies":[')
+            for i, m in enumerate(metrics_list):
+                if i:
+                    f.write(b',')
+                f.write(orjson.dumps(m, option=orjson.OPT_SERIALIZE_DATACLASS))
+            f.write(b']}')
+    else:
+        with open(filepath, 'w', buffering=1 << 20) as f:
+            f.write('{"timestamp": %s, "strategies": [' % json.dumps(now.isoformat()))
+            for i, m in enumerate(metrics_list):
+                if i:
+                    f.write(', ')
+                json.dump({n: getattr(m, n) for n in _FIELDS}, f, default=str)
+            f.write(']}')
+
     return filepath
 
 
-def generate_report():
-    """Generate complete comparison report"""
-    strategies = [
-        ("Strategy A (7-Day)", "data/paper_trading_strategy_a.db", 1000),
-        ("Strategy B (Multipliers)", "data/paper_trading_strategy_b.db", 1000),
-        ("Strategy C (Tiered)", "data/paper_trading_strategy_c.db", 1000),
-        ("Original (Baseline)", "data/paper_trading.db", 1000),
-    ]
-    
-    metrics_list = []
-    for name, db_path, bankroll in strategies:
+STRATEGIES = [
+    ("Strategy A (7-Day)", "data/paper_trading_strategy_a.db", 1000),
+    ("Strategy B (Multipliers)", "data/paper_trading_strategy_b.db", 1000),
+    ("Strategy C (Tiered)", "data/paper_trading_strategy_c.db", 1000),
+    ("Original (Baseline)", "data/paper_trading.db", 1000),
+]
+
+
+def _load_all(strategies: List[Tuple[str, str, float]]) -> List[StrategyMetrics]:
+    """Load metrics for every strategy, skipping any that fail"""
+    # Each strategy aggregates an independent SQLite DB, and _connect
+    # hands every call its own connection - so the four loads can run
+    # concurrently. map() keeps the original strategy order.
+    def load_one(entry):
+        name, db_path, bankroll = entry
         try:
-            metrics = calculate_strategy_metrics(name, db_path, bankroll)
-            metrics_list.append(metrics)
+            return calculate_strategy_metrics(name, db_path, bankroll)
         except Exception as e:
             print(f"❌ Error loading {name}: {e}")
-    
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(8, len(strategies))) as ex:
+        results = list(ex.map(load_one, strategies))
+    return [m for m in results if m is not None]
+
+
+def generate_report():
+    """Generate complete comparison report"""
+    # One clock snapshot for the header, export timestamp and filename
+    now = datetime.now()
+    metrics_list = _load_all(STRATEGIES)
+
     # Print dashboard
-    print_dashboard(metrics_list)
-    
+    print_dashboard(metrics_list, now=now)
+
     # Export to JSON
     try:
-        filepath = export_to_json(metrics_list)
+        filepath = export_to_json(metrics_list, now=now)
         print(f"\n✅ Report exported to: {filepath}")
     except Exception as e:
         print(f"\n❌ Export failed: {e}")
@@ -248,21 +360,7 @@ if __name__ == "__main__":
     
     if len(sys.argv) > 1 and sys.argv[1] == 'json':
         # Just export, don't print
-        strategies = [
-            ("Strategy A (7-Day)", "data/paper_trading_strategy_a.db", 1000),
-            ("Strategy B (Multipliers)", "data/paper_trading_strategy_b.db", 1000),
-            ("Strategy C (Tiered)", "data/paper_trading_strategy_c.db", 1000),
-            ("Original (Baseline)", "data/paper_trading.db", 1000),
-        ]
-        
-        metrics_list = []
-        for name, db_path, bankroll in strategies:
-            try:
-                metrics = calculate_strategy_metrics(name, db_path, bankroll)
-                metrics_list.append(metrics)
-            except Exception as e:
-                print(f"❌ Error loading {name}: {e}")
-        
+        metrics_list = _load_all(STRATEGIES)
         filepath = export_to_json(metrics_list)
         print(f"Report exported to: {filepath}")
     else:
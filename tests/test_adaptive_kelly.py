@@ -14,8 +14,12 @@ from strategies.adaptive_kelly import AdaptiveKelly, PortfolioKelly
 
 class TestAdaptiveKelly(unittest.TestCase):
     
-    def setUp(self):
-        self.kelly = AdaptiveKelly(
+    @classmethod
+    def setUpClass(cls):
+        # One instance for the class - position sizing is deterministic
+        # for given inputs, and the cache-persistence test restores the
+        # tracker state it touches
+        cls.kelly = AdaptiveKelly(
             base_fraction=0.25,
             max_fraction=0.50,
             min_fraction=0.05
@@ -157,6 +161,140 @@ class TestAdaptiveKelly(unittest.TestCase):
         self.assertEqual(result.side, 'NO')
         self.assertGreater(result.kelly_fraction, 0)
     
+    def test_batch_matches_scalar(self):
+        """Test that the batch path reproduces scalar results"""
+        import numpy as np
+
+        prices = np.array([0.50, 0.70, 0.30, 0.55])
+        probs = np.array([0.70, 0.40, 0.35, 0.55])
+        confs = np.array([0.8, 0.6, 0.9, 0.5])
+        exposures = np.array([0.0, 0.25, 0.35, 0.10])
+        drawdowns = np.array([0.0, 0.15, 0.05, 0.25])
+
+        batch = self.kelly.calculate_position_size_batch(
+            bankroll=10000,
+            market_prices=prices,
+            estimated_probs=probs,
+            confidences=confs,
+            correlated_exposures=exposures,
+            current_drawdowns=drawdowns
+        )
+
+        for i in range(len(prices)):
+            scalar = self.kelly.calculate_position_size(
+                bankroll=10000,
+                market_price=prices[i],
+                estimated_prob=probs[i],
+                confidence=confs[i],
+                correlated_exposure=exposures[i],
+                current_drawdown=drawdowns[i]
+            )
+            self.assertEqual(batch['side'][i], scalar.side)
+            self.assertAlmostEqual(batch['kelly_fraction'][i], scalar.kelly_fraction)
+            self.assertAlmostEqual(batch['adjusted_fraction'][i], scalar.adjusted_fraction)
+            self.assertAlmostEqual(batch['position_size'][i], scalar.position_size)
+            self.assertAlmostEqual(batch['shares'][i], scalar.shares)
+
+    def test_screen_filters_candidates(self):
+        """Test the vectorized pre-filter mask"""
+        import numpy as np
+
+        prices = np.array([0.50, 0.50, 0.70, 0.50])
+        probs = np.array([0.70, 0.52, 0.40, 0.50])
+
+        mask = AdaptiveKelly.screen(prices, probs)
+
+        self.assertTrue(mask[0])   # 20% edge, positive EV
+        self.assertFalse(mask[1])  # Edge below 5%
+        self.assertTrue(mask[2])   # NO-side edge
+        self.assertFalse(mask[3])  # No edge at all
+
+    def test_batch_fractions(self):
+        """Test vectorized batch Kelly fractions"""
+        import numpy as np
+
+        edges = np.array([0.10, 0.05, -0.02, 0.50])
+        variances = np.array([0.50, 0.50, 0.50, 0.01])
+
+        fractions = AdaptiveKelly.batch_fractions(edges, variances)
+
+        self.assertEqual(fractions.shape, edges.shape)
+        # Positive edge gets a positive fraction
+        self.assertGreater(fractions[0], 0)
+        # Negative edge clips to zero
+        self.assertEqual(fractions[2], 0.0)
+        # Huge edge clips at max_pos
+        self.assertEqual(fractions[3], 0.20)
+        # Scales with edge
+        self.assertGreater(fractions[0], fractions[1])
+
+    def test_batch_fractions_zero_variance(self):
+        """Test that zero variance yields zero fraction, not a crash"""
+        import numpy as np
+
+        fractions = AdaptiveKelly.batch_fractions(
+            np.array([0.10]), np.array([0.0])
+        )
+
+        self.assertEqual(fractions[0], 0.0)
+
+    def test_evaluate_portfolio_fused_sweep(self):
+        """Test that evaluate_portfolio screens, sizes and respects exposure"""
+        portfolio = PortfolioKelly(max_total_exposure=0.50)
+        opportunities = [
+            {'market_slug': 'good-edge', 'market_price': 0.40,
+             'estimated_prob': 0.55, 'confidence': 0.8, 'category': 'politics'},
+            {'market_slug': 'no-edge', 'market_price': 0.50,
+             'estimated_prob': 0.51, 'category': 'politics'},
+            {'market_slug': 'other-cat', 'market_price': 0.30,
+             'estimated_prob': 0.45, 'confidence': 0.7, 'category': 'sports'},
+        ]
+
+        allocations = self.kelly.evaluate_portfolio(10000, opportunities, portfolio)
+
+        slugs = [a['market_slug'] for a in allocations]
+        self.assertIn('good-edge', slugs)
+        self.assertIn('other-cat', slugs)
+        self.assertNotIn('no-edge', slugs)  # Below min_edge screen
+
+        # Accepted positions were added to the portfolio as fractions
+        self.assertEqual(len(portfolio.positions), len(allocations))
+        self.assertLessEqual(portfolio.total_exposure, 0.50)
+        for alloc in allocations:
+            self.assertGreater(alloc['size'], 0)
+            self.assertGreater(alloc['shares'], 0)
+            self.assertIn(alloc['side'], ('YES', 'NO'))
+
+    def test_dynamic_kelly_cache_persists(self):
+        """Test that the dynamic fraction survives a 'restart' via disk cache"""
+        import json
+        import tempfile
+
+        # Restore the shared instance's tracker path afterwards - the
+        # class-level kelly outlives the temporary directory
+        original_path = self.kelly.tracker.file_path
+        self.addCleanup(setattr, self.kelly.tracker, 'file_path', original_path)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.kelly.tracker.file_path = Path(tmp) / 'predictions.json'
+            self.kelly._dyn_kelly_cache = None
+
+            fraction = self.kelly._get_dynamic_kelly_fraction()
+
+            cache_path = Path(tmp) / 'kelly_cache.json'
+            self.assertTrue(cache_path.exists())
+
+            with open(cache_path) as f:
+                cached = json.load(f)
+            version = self.kelly.tracker.calibration_version
+            self.assertAlmostEqual(cached[version], fraction)
+
+            # A fresh instance pointed at the same state reads it back
+            fresh = AdaptiveKelly(base_fraction=0.25)
+            fresh.tracker = self.kelly.tracker
+            fresh._dyn_kelly_cache = None
+            self.assertAlmostEqual(fresh._get_dynamic_kelly_fraction(), fraction)
+
     def test_position_within_bounds(self):
         """Test that final position is within min/max bounds"""
         result = self.kelly.calculate_position_size(
@@ -196,6 +334,17 @@ class TestPortfolioKelly(unittest.TestCase):
         self.assertAlmostEqual(politics_exp, 0.15)  # 10% + 5%
         self.assertAlmostEqual(sports_exp, 0.08)
     
+    def test_total_exposure_invariant(self):
+        """Test the running total stays consistent through add/remove"""
+        self.portfolio.add_position('market-1', 'YES', 0.10, 0.15, 0.05, 'politics')
+        self.portfolio.add_position('market-2', 'NO', 0.05, 0.10, 0.03, 'sports')
+        self.portfolio.add_position('market-1', 'YES', 0.12, 0.15, 0.05, 'politics')  # Replace
+        self.portfolio.remove_position('market-2')
+
+        expected = sum(p['size'] for p in self.portfolio.positions.values())
+        self.assertAlmostEqual(self.portfolio.total_exposure, expected)
+        self.assertAlmostEqual(self.portfolio.total_exposure, 0.12)
+
     def test_can_add_position_within_limits(self):
         """Test that positions within limits are allowed"""
         self.portfolio.add_position('market-1', 'YES', 0.10, 0.15, 0.05, 'politics')
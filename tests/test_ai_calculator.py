@@ -14,8 +14,11 @@ from utils.ai_calculator import AIOddsCalculator
 
 class TestAIOddsCalculator(unittest.TestCase):
     
-    def setUp(self):
-        self.calc = AIOddsCalculator(bankroll=10000)
+    @classmethod
+    def setUpClass(cls):
+        # The calculator wires up estimator, kelly, portfolio and tracker -
+        # built once since these tests only read from it
+        cls.calc = AIOddsCalculator(bankroll=10000)
     
     def test_initialization(self):
         """Test calculator initialization"""
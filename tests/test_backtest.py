@@ -6,6 +6,8 @@ import unittest
 import sys
 from pathlib import Path
 
+import numpy as np
+
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -13,30 +15,33 @@ from utils.backtest import BacktestEngine, Trade, BacktestResult
 
 
 class TestBacktestEngine(unittest.TestCase):
-    
+
+    @classmethod
+    def setUpClass(cls):
+        # Synthetic random walks generated once for the whole class -
+        # vectorized over a (markets, steps) grid instead of per-step
+        # random.gauss calls. The backtest never mutates the input rows.
+        rng = np.random.default_rng(42)
+        deltas = rng.normal(0, 0.03, (10, 5))
+        prices = np.clip(0.5 + np.cumsum(deltas, axis=1), 0.05, 0.95)
+        prices = np.concatenate([np.full((10, 1), 0.5), prices], axis=1)
+        outcomes = (prices[:, -1] > 0.5).astype(np.int8)
+
+        cls.historical_data = [
+            {
+                'timestamp': f'2024-01-{i+1:02d}T{j:02d}:00:00',
+                'market_slug': f'market-{i}',
+                'question': f'Test market {i}?',
+                'price': float(prices[i, j]),
+                'outcome': int(outcomes[i]),
+                'category': 'general'
+            }
+            for i in range(prices.shape[0])
+            for j in range(prices.shape[1])
+        ]
+
     def setUp(self):
         self.engine = BacktestEngine(initial_bankroll=10000)
-        
-        # Generate synthetic test data
-        self.historical_data = []
-        import random
-        random.seed(42)
-        
-        for i in range(10):
-            base_price = 0.50
-            prices = [base_price]
-            for _ in range(5):
-                prices.append(max(0.05, min(0.95, prices[-1] + random.gauss(0, 0.03))))
-            
-            for j, price in enumerate(prices):
-                self.historical_data.append({
-                    'timestamp': f'2024-01-{i+1:02d}T{j:02d}:00:00',
-                    'market_slug': f'market-{i}',
-                    'question': f'Test market {i}?',
-                    'price': price,
-                    'outcome': 1 if prices[-1] > 0.5 else 0,
-                    'category': 'general'
-                })
     
     def test_initialization(self):
         """Test engine initialization"""
@@ -51,6 +51,28 @@ class TestPaperTradingDB(unittest.TestCase):
         self.assertEqual(retrieved['intended_side'], 'YES')
         self.assertEqual(retrieved['intended_price'], 0.65)
     
+    def test_save_trades_many(self):
+        """Test batch insert saves all trades in one transaction"""
+        trades = [
+            {
+                'timestamp': datetime.now().isoformat(),
+                'market_slug': f'batch-market-{i}',
+                'intended_side': 'YES',
+                'intended_price': 0.50 + i * 0.01,
+                'intended_size': 50.0,
+                'strategy': 'ensemble'
+            }
+            for i in range(5)
+        ]
+
+        trade_ids = self.db.save_trades_many(trades)
+
+        self.assertEqual(len(trade_ids), 5)
+        for i, trade_id in enumerate(trade_ids):
+            retrieved = self.db.get_trade(trade_id)
+            self.assertIsNotNone(retrieved)
+            self.assertEqual(retrieved['market_slug'], f'batch-market-{i}')
+
     def test_update_outcome(self):
         """Test updating trade with outcome"""
         trade = {
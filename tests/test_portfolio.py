@@ -133,6 +133,23 @@ class TestStrategyPortfolio(unittest.TestCase):
         self.assertIn('arbitrage', self.portfolio.strategies)
         self.assertIn('ensemble', self.portfolio.strategies)
     
+    def test_update_price_called_once_per_market(self):
+        """Test the shared estimator records one price tick per generate_signals call"""
+        calls = []
+        original = self.portfolio.estimator.update_price
+        self.portfolio.estimator.update_price = lambda slug, price: (
+            calls.append((slug, price)), original(slug, price)
+        )
+
+        self.portfolio.generate_signals(
+            'dedup-market',
+            question='Will it happen?',
+            current_price=0.55,
+            category='general'
+        )
+
+        self.assertEqual(calls, [('dedup-market', 0.55)])
+
     def test_generate_signals(self):
         """Test signal generation from all strategies"""
         for i in range(5):
@@ -205,6 +222,40 @@ class TestStrategyPortfolio(unittest.TestCase):
         # Should be a positive number for profitable strategy
         self.assertIsInstance(sharpe, float)
 
+    def test_win_counter_tracks_evictions(self):
+        """Test the O(1) win counter survives wins being evicted by losses"""
+        strategy = self.portfolio.strategies['ensemble']
+
+        # Fill the window entirely with wins, then push them all out
+        # with losses - the counter must follow the window, not history
+        for _ in range(strategy.WINDOW):
+            strategy.record_result(0.05)
+        self.assertEqual(strategy.get_win_rate(), 1.0)
+
+        for _ in range(strategy.WINDOW):
+            strategy.record_result(-0.05)
+        self.assertEqual(strategy.get_win_rate(), 0.0)
+
+    def test_rolling_stats_match_naive_after_eviction(self):
+        """Test cached Sharpe/win-rate stay correct once trades fall off the window"""
+        import numpy as np
+
+        strategy = self.portfolio.strategies['momentum']
+
+        # Overfill the 100-trade window so old trades get evicted
+        rng = np.random.default_rng(42)
+        for pnl in rng.normal(0.02, 0.1, size=150):
+            strategy.record_result(float(pnl))
+
+        history = np.array(strategy.performance_history)
+        self.assertEqual(len(history), 100)
+
+        expected_sharpe = np.mean(history) / np.std(history)
+        self.assertAlmostEqual(strategy.get_sharpe_ratio(), expected_sharpe, places=10)
+
+        expected_win_rate = np.count_nonzero(history > 0) / len(history)
+        self.assertAlmostEqual(strategy.get_win_rate(), expected_win_rate, places=10)
+
 
 if __name__ == '__main__':
     unittest.main()
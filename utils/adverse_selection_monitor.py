@@ -10,6 +10,7 @@ from typing import Dict, List, Optional
 from collections import deque
 
 from utils.paper_trading_db import PaperTradingDB
+from operator import itemgetter
 
 
 class AdverseSelectionMonitor:
@@ -187,7 +188,7 @@ class AlphaDecayTracker:
             return []
         
         # Sort by timestamp
-        trades_sorted = sorted(trades, key=lambda x: x['timestamp'])
+        trades_sorted = sorted(trades, key=itemgetter('timestamp'))
         
         results = []
         for i in range(window, len(trades_sorted) + 1):
@@ -6,6 +6,7 @@ Essential before deploying with real capital.
 
 import numpy as np
 import pandas as pd
+import pyarrow.dataset as pa_ds
 from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -14,6 +15,7 @@ import json
 
 from strategies.adaptive_kelly import AdaptiveKelly
 from models.edge_estimator import EnsembleEdgeEstimator
+from utils.jit import njit
 from utils.prediction_tracker import PredictionTracker
 from utils.take_profit_calculator import (
     calculate_take_profit,
@@ -22,6 +24,103 @@ from utils.take_profit_calculator import (
 )
 
 
+@njit(cache=True)
+def _scan_tp_hit(prices: np.ndarray, target_price: float, is_yes: bool) -> int:
+    """
+    Find the first price at or past the take-profit target.
+
+    The per-market TP scan is the innermost numeric loop of a backtest;
+    keeping it a flat array pass lets numba compile it when available.
+
+    Returns index into `prices`, or -1 if the target is never hit.
+    """
+    for i in range(prices.shape[0]):
+        if is_yes:
+            if prices[i] >= target_price:
+                return i
+        elif prices[i] <= target_price:
+            return i
+    return -1
+
+
+@njit(cache=True)
+def _sharpe(returns: np.ndarray) -> float:
+    """
+    Sharpe ratio over per-trade returns, capped to [-100, 100].
+
+    Mirrors the previous Python branch structure exactly: fewer than two
+    returns or near-zero sample std yields 0.0.
+    """
+    n = returns.shape[0]
+    if n < 2:
+        return 0.0
+    mean = 0.0
+    for i in range(n):
+        mean += returns[i]
+    mean /= n
+    var = 0.0
+    for i in range(n):
+        diff = returns[i] - mean
+        var += diff * diff
+    std = (var / (n - 1)) ** 0.5
+    if std > 1e-10:
+        sharpe = mean / std
+        if sharpe > 100.0:
+            return 100.0
+        if sharpe < -100.0:
+            return -100.0
+        return sharpe
+    return 0.0
+
+
+@njit(cache=True)
+def _sortino(returns: np.ndarray) -> float:
+    """
+    Sortino ratio (downside deviation only), capped to [-1000, 1000].
+
+    Edge cases match the old list-based code: no downside returns caps
+    at 100 when profitable, and a single downside return (undefined
+    sample std) falls into the small-variance branch.
+    """
+    n = returns.shape[0]
+    if n < 2:
+        return 0.0
+    mean = 0.0
+    for i in range(n):
+        mean += returns[i]
+    mean /= n
+
+    down_n = 0
+    down_mean = 0.0
+    for i in range(n):
+        if returns[i] < 0.0:
+            down_n += 1
+            down_mean += returns[i]
+
+    if down_n == 0:
+        # All trades profitable - theoretically infinite, cap it
+        return 100.0 if mean > 0 else 0.0
+
+    down_std = 0.0
+    if down_n > 1:
+        down_mean /= down_n
+        down_var = 0.0
+        for i in range(n):
+            if returns[i] < 0.0:
+                diff = returns[i] - down_mean
+                down_var += diff * diff
+        down_std = (down_var / (down_n - 1)) ** 0.5
+
+    if down_std > 1e-10:
+        sortino = mean / down_std
+        if sortino > 1000.0:
+            return 1000.0
+        if sortino < -1000.0:
+            return -1000.0
+        return sortino
+    return 100.0 if mean > 0 else -100.0
+
+
 @dataclass
 class Trade:
     """Single trade record"""
@@ -245,16 +344,15 @@ class BacktestEngine:
                 take_profit_price = tp_level.target_price
                 take_profit_pct = tp_level.target_pct_move
                 
-                # Iterate through price history to check if TP is hit
-                for data in market_data[1:]:  # Skip entry
-                    current_price = data['price']
-                    
-                    if check_take_profit_hit(entry_price, current_price, tp_level, kelly_result.side):
-                        # TP hit - exit at target price
-                        exit_price = tp_level.target_price
-                        exit_reason = 'tp'
-                        exit_timestamp = data['timestamp']
-                        break
+                # Scan price history for a TP hit (skip entry point)
+                prices = np.array([d['price'] for d in market_data[1:]], dtype=np.float64)
+                hit_idx = _scan_tp_hit(prices, tp_level.target_price, kelly_result.side == 'YES')
+
+                if hit_idx >= 0:
+                    # TP hit - exit at target price
+                    exit_price = tp_level.target_price
+                    exit_reason = 'tp'
+                    exit_timestamp = market_data[1 + hit_idx]['timestamp']
         
         # Calculate holding days
         holding_days = calculate_holding_days(
@@ -359,44 +457,14 @@ class BacktestEngine:
         # Drawdown
         max_drawdown_pct = (self.max_drawdown / self.peak_bankroll) * 100 if self.peak_bankroll > 0 else 0
         
-        # Sharpe ratio (annualized)
-        returns = [t.pnl_pct for t in self.trades if t.pnl_pct is not None]
-        if len(returns) > 1:
-            avg_return = np.mean(returns)
-            std_return = np.std(returns, ddof=1)  # Use sample std
-            
-            # Avoid division by near-zero - require minimum variance
-            if std_return > 1e-10:  # Minimum 0.00000001% std
-                sharpe = avg_return / std_return
-                # Cap at reasonable bounds
-                sharpe = max(-100, min(100, sharpe))
-            else:
-                # Very low variance - Sharpe is undefined, return 0
-                sharpe = 0.0
-        else:
-            sharpe = 0.0
-        
-        # Sortino ratio (downside deviation only)
-        if len(returns) > 1:
-            avg_return = np.mean(returns)
-            downside_returns = [r for r in returns if r < 0]
-            
-            if downside_returns:
-                downside_std = np.std(downside_returns, ddof=1)
-                # Avoid division by near-zero
-                if downside_std > 1e-10:
-                    sortino = avg_return / downside_std
-                    # Cap at reasonable bounds
-                    sortino = max(-1000, min(1000, sortino))
-                else:
-                    # Small downside variance
-                    sortino = 100.0 if avg_return > 0 else -100.0
-            else:
-                # No downside returns - all trades were profitable
-                # Sortino is theoretically infinite, cap at large positive value
-                sortino = 100.0 if avg_return > 0 else 0.0
-        else:
-            sortino = 0.0
+        # Risk-adjusted ratios - single float64 pass through the JIT'd
+        # kernels instead of list comprehensions plus numpy temporaries
+        returns = np.fromiter(
+            (t.pnl_pct for t in self.trades if t.pnl_pct is not None),
+            dtype=np.float64
+        )
+        sharpe = float(_sharpe(returns))
+        sortino = float(_sortino(returns))
         
         # Calculate take-profit metrics
         tp_exit_count = sum(1 for t in self.trades if t.exit_reason == 'tp')
@@ -501,28 +569,36 @@ class BacktestEngine:
     def save_results(self, result: BacktestResult, filepath: str):
         """Save backtest results to file"""
     @staticmethod
-    def load_from_parquet(parquet_path: Union[str, Path]) -> List[Dict]:
+    def load_from_parquet(parquet_path: Union[str, Path], batch_size: int = 65536) -> List[Dict]:
         """
         Load historical data from Parquet file.
-        
+
+        Streams RecordBatches via pyarrow.dataset instead of materializing
+        a full DataFrame first, so peak memory stays at one batch plus the
+        output records.
+
         Args:
             parquet_path: Path to Parquet file
-            
+            batch_size: Rows per streamed batch
+
         Returns:
             List of dicts with market data
         """
-        df = pd.read_parquet(parquet_path)
-        
-        # Convert DataFrame to list of dicts
-        records = df.to_dict('records')
-        
-        # Ensure required fields exist
+        dataset = pa_ds.dataset(str(parquet_path), format='parquet')
         required_fields = ['market_slug', 'price', 'outcome']
-        for record in records:
-            for field in required_fields:
-                if field not in record:
-                    record[field] = None
-        
+
+        records = []
+        for batch in dataset.to_batches(batch_size=batch_size):
+            batch_records = batch.to_pylist()
+
+            # Ensure required fields exist
+            for record in batch_records:
+                for field in required_fields:
+                    if field not in record:
+                        record[field] = None
+
+            records.extend(batch_records)
+
         return records
     
     @staticmethod
@@ -0,0 +1,31 @@
+"""
+Optional Numba acceleration.
+
+Exposes `njit` as either the real numba decorator or a no-op passthrough,
+so numeric kernels run everywhere and get JIT-compiled when numba is
+installed. Import from here instead of numba directly:
+
+    from utils.jit import njit
+
+    @njit(cache=True)
+    def kernel(arr): ...
+"""
+
+from typing import Any, Callable
+
+try:
+    from numba import njit  # noqa: F401
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args: Any, **kwargs: Any) -> Callable:
+        """No-op stand-in for numba.njit when numba isn't installed"""
+        # Bare usage: @njit
+        if args and callable(args[0]):
+            return args[0]
+
+        # Parameterized usage: @njit(cache=True, ...)
+        def wrap(func: Callable) -> Callable:
+            return func
+        return wrap
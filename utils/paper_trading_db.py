@@ -7,6 +7,7 @@ Timestamp: 2026-02-03 19:40 GMT+1
 import sqlite3
 import uuid
 import json
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -29,9 +30,31 @@ class PaperTradingDB:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
     
+    @contextmanager
+    def _connect(self):
+        """Open a connection with the write-heavy PRAGMA profile.
+        
+        WAL journaling with synchronous=NORMAL drops the fsync per
+        commit and lets readers proceed during writes; temp tables,
+        a 64MB page cache and the mmap window keep reads in memory. Commit/rollback semantics
+        match the plain connection context manager, and the connection
+        is closed afterwards so WAL side files get checkpointed away.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-65536")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
     def _init_db(self):
         """Initialize database schema"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # Create paper_trades table
@@ -78,13 +101,30 @@ class PaperTradingDB:
         
         # Migrate: Add take-profit columns if they don't exist
         self._migrate_add_take_profit_columns()
-        
+
         # NEW: Migrate: Add resolution time columns
         self._migrate_add_resolution_columns()
+
+        # Indexes on migrated columns - created after the migrations so
+        # the columns exist. The composite (status, exit_reason) index
+        # lets the dashboard aggregates run as index scans, and the
+        # partial holding_days index skips the open-trade NULLs.
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_status_exit_reason
+                ON paper_trades(status, exit_reason)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_holding_days
+                ON paper_trades(holding_days)
+                WHERE holding_days IS NOT NULL
+            """)
+            conn.commit()
     
     def _migrate_add_resolution_columns(self):
         """Add resolution time columns to existing database (migration)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # Get existing columns
@@ -110,7 +150,7 @@ class PaperTradingDB:
     
     def _migrate_add_take_profit_columns(self):
         """Add take-profit columns to existing database (migration)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # Get existing columns
@@ -136,6 +176,50 @@ class PaperTradingDB:
             
             conn.commit()
     
+    _INSERT_TRADE_SQL = """
+        INSERT INTO paper_trades (
+            id, timestamp, market_slug, market_question,
+            intended_side, intended_price, intended_size,
+            executed_price, executed_timestamp, outcome, pnl,
+            strategy, edge, confidence, status, notes,
+            take_profit_price, take_profit_pct, exit_reason,
+            holding_days, exit_timestamp,
+            resolution_date, days_to_resolve, priority_score
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _trade_row(trade_id: str, trade: Dict[str, Any], default_ts: Optional[str] = None) -> tuple:
+        """Build the parameter tuple for an insert"""
+        if default_ts is None:
+            default_ts = datetime.now().isoformat()
+        return (
+            trade_id,
+            trade.get('timestamp', default_ts),
+            trade.get('market_slug', ''),
+            trade.get('market_question', ''),
+            trade.get('intended_side', ''),
+            trade.get('intended_price', 0.0),
+            trade.get('intended_size', 0.0),
+            trade.get('executed_price'),
+            trade.get('executed_timestamp'),
+            trade.get('outcome'),
+            trade.get('pnl'),
+            trade.get('strategy', 'ensemble'),
+            trade.get('edge', 0.0),
+            trade.get('confidence', 0.0),
+            trade.get('status', 'open'),
+            trade.get('notes', ''),
+            trade.get('take_profit_price'),
+            trade.get('take_profit_pct'),
+            trade.get('exit_reason'),
+            trade.get('holding_days'),
+            trade.get('exit_timestamp'),
+            trade.get('resolution_date'),
+            trade.get('days_to_resolve'),
+            trade.get('priority_score')
+        )
+
     def save_trade(self, trade: Dict[str, Any]) -> str:
         """
         Save a paper trade to the database.
@@ -148,53 +232,43 @@ class PaperTradingDB:
         """
         trade_id = str(uuid.uuid4())
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO paper_trades (
-                    id, timestamp, market_slug, market_question,
-                    intended_side, intended_price, intended_size,
-                    executed_price, executed_timestamp, outcome, pnl,
-                    strategy, edge, confidence, status, notes,
-                    take_profit_price, take_profit_pct, exit_reason,
-                    holding_days, exit_timestamp,
-                    resolution_date, days_to_resolve, priority_score
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                trade_id,
-                trade.get('timestamp', datetime.now().isoformat()),
-                trade.get('market_slug', ''),
-                trade.get('market_question', ''),
-                trade.get('intended_side', ''),
-                trade.get('intended_price', 0.0),
-                trade.get('intended_size', 0.0),
-                trade.get('executed_price'),
-                trade.get('executed_timestamp'),
-                trade.get('outcome'),
-                trade.get('pnl'),
-                trade.get('strategy', 'ensemble'),
-                trade.get('edge', 0.0),
-                trade.get('confidence', 0.0),
-                trade.get('status', 'open'),
-                trade.get('notes', ''),
-                trade.get('take_profit_price'),
-                trade.get('take_profit_pct'),
-                trade.get('exit_reason'),
-                trade.get('holding_days'),
-                trade.get('exit_timestamp'),
-                trade.get('resolution_date'),
-                trade.get('days_to_resolve'),
-                trade.get('priority_score')
-            ))
-            
+        with self._connect() as conn:
+            conn.execute(self._INSERT_TRADE_SQL, self._trade_row(trade_id, trade))
             conn.commit()
         
         return trade_id
     
+    def save_trades_many(self, trades: List[Dict[str, Any]]) -> List[str]:
+        """
+        Save a batch of trades in a single transaction.
+        
+        One commit (and one fsync) instead of one per trade - bulk
+        signal saves at cycle end go from N commits to 1.
+        
+        Args:
+            trades: List of trade dicts (same shape as save_trade)
+            
+        Returns:
+            List of trade IDs, in input order
+        """
+        trade_ids = [str(uuid.uuid4()) for _ in trades]
+        
+        # One fallback timestamp for the whole batch - formatting
+        # calendar fields per row is wasted work within a transaction
+        default_ts = datetime.now().isoformat()
+        
+        with self._connect() as conn:
+            conn.executemany(
+                self._INSERT_TRADE_SQL,
+                [self._trade_row(tid, t, default_ts) for tid, t in zip(trade_ids, trades)]
+            )
+            conn.commit()
+        
+        return trade_ids
+    
     def get_trade(self, trade_id: str) -> Optional[Dict]:
         """Get a single trade by ID"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -210,7 +284,7 @@ class PaperTradingDB:
     
     def get_trades_by_market(self, market_slug: str) -> List[Dict]:
         """Get all trades for a specific market"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -235,7 +309,7 @@ class PaperTradingDB:
             end_date: ISO format date string
             status: Optional filter by status ('open', 'closed')
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -274,7 +348,7 @@ class PaperTradingDB:
         Returns:
             True if updated successfully
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -294,7 +368,7 @@ class PaperTradingDB:
         notes: str = ""
     ) -> bool:
         """Update the actual executed price for a trade"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -327,7 +401,7 @@ class PaperTradingDB:
         Returns:
             True if updated successfully
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             if priority_score is not None:
@@ -350,7 +424,7 @@ class PaperTradingDB:
     
     def get_open_trades(self) -> List[Dict]:
         """Get all trades that haven't been resolved yet"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -360,9 +434,118 @@ class PaperTradingDB:
             
             return [dict(row) for row in cursor.fetchall()]
     
+    # Kept as class constants so sqlite3's per-connection statement
+    # cache (keyed on the SQL text) reuses the compiled statements
+    # instead of re-parsing them per dashboard render
+    _AGG_OPEN_SQL = """
+        SELECT COUNT(*),
+               COALESCE(SUM(intended_size), 0),
+               COALESCE(SUM(edge), 0)
+        FROM paper_trades WHERE status = 'open'
+    """
+
+    _AGG_CLOSED_SQL = """
+        SELECT COUNT(*),
+               COALESCE(SUM(pnl), 0),
+               COALESCE(SUM(pnl > 0), 0),
+               COALESCE(SUM(exit_reason = 'tp'), 0),
+               COALESCE(SUM(exit_reason = 'stop_loss'), 0),
+               COALESCE(SUM(exit_reason = 'resolution'), 0),
+               COALESCE(SUM(CASE WHEN exit_reason = 'tp' THEN pnl END), 0),
+               COALESCE(SUM(CASE WHEN exit_reason = 'stop_loss' THEN pnl END), 0),
+               COALESCE(SUM(CASE WHEN exit_reason = 'resolution' THEN pnl END), 0),
+               COALESCE(SUM(holding_days), 0),
+               COUNT(holding_days),
+               MIN(holding_days),
+               MAX(holding_days),
+               COALESCE(SUM(edge), 0),
+               COALESCE(SUM(intended_size), 0)
+        FROM paper_trades WHERE status = 'closed'
+    """
+
+    def get_strategy_aggregates(self) -> Dict[str, float]:
+        """Dashboard aggregates computed inside SQLite in two rows.
+
+        Returns the sums and counts needed for strategy metrics -
+        open exposure/edge plus the closed-trade P&L, win, exit-reason,
+        holding-day and size breakdowns - without marshaling every
+        trade row into Python.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self._AGG_OPEN_SQL)
+            open_n, open_size, open_edge = cursor.fetchone()
+
+            cursor.execute(self._AGG_CLOSED_SQL)
+            (closed_n, pnl_sum, wins, tp_n, sl_n, res_n,
+             tp_pnl, sl_pnl, res_pnl, hold_sum, hold_n,
+             hold_min, hold_max, closed_edge, closed_size) = cursor.fetchone()
+        
+        return {
+            'open_trades': open_n,
+            'open_exposure': float(open_size),
+            'open_edge_sum': float(open_edge),
+            'closed_trades': closed_n,
+            'total_pnl': float(pnl_sum),
+            'win_count': int(wins),
+            'loss_count': closed_n - int(wins),
+            'tp_exits': int(tp_n),
+            'sl_exits': int(sl_n),
+            'resolution_exits': int(res_n),
+            'tp_pnl': float(tp_pnl),
+            'sl_pnl': float(sl_pnl),
+            'resolution_pnl': float(res_pnl),
+            'holding_days_sum': float(hold_sum),
+            'holding_days_count': hold_n,
+            'holding_days_min': hold_min,
+            'holding_days_max': hold_max,
+            'closed_edge_sum': float(closed_edge),
+            'closed_size_sum': float(closed_size),
+        }
+    
+    def has_trades(self) -> bool:
+        """Cheap existence probe - one indexed row at most."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT EXISTS(SELECT 1 FROM paper_trades LIMIT 1)")
+            return bool(cursor.fetchone()[0])
+
+    def get_open_exposure(self) -> float:
+        """Total open-trade exposure, summed inside SQLite."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT COALESCE(SUM(intended_size), 0) FROM paper_trades WHERE status = 'open'"
+            )
+            return float(cursor.fetchone()[0])
+    
+    def get_open_exposure_by_tier(self) -> Dict[str, float]:
+        """Open-trade exposure bucketed by resolution tier, summed inside SQLite.
+        
+        Tiers follow Strategy C's ladder: <30 days, 30-90 days, and
+        everything else (including trades with no recorded horizon).
+        """
+        exposures = {'tier1': 0.0, 'tier2': 0.0, 'tier3': 0.0}
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT CASE
+                           WHEN days_to_resolve < 30 THEN 'tier1'
+                           WHEN days_to_resolve < 90 THEN 'tier2'
+                           ELSE 'tier3'
+                       END AS tier,
+                       SUM(intended_size)
+                FROM paper_trades
+                WHERE status = 'open'
+                GROUP BY tier
+            """)
+            for tier, total in cursor.fetchall():
+                exposures[tier] = float(total or 0)
+        return exposures
+    
     def get_closed_trades(self) -> List[Dict]:
         """Get all resolved trades with outcomes"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -379,7 +562,7 @@ class PaperTradingDB:
         Returns:
             Dict with win_rate, total_pnl, avg_trade, etc.
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # Get closed trades
@@ -425,7 +608,7 @@ class PaperTradingDB:
     
     def get_trades_by_exit_reason(self, exit_reason: str) -> List[Dict]:
         """Get all trades with a specific exit reason ('tp', 'resolution', etc.)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -438,7 +621,7 @@ class PaperTradingDB:
     
     def get_avg_holding_time(self) -> Dict:
         """Get average holding time metrics for closed trades"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -490,7 +673,7 @@ class PaperTradingDB:
         Returns:
             True if updated successfully
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -507,7 +690,7 @@ class PaperTradingDB:
     
     def get_exit_reason_summary(self) -> Dict:
         """Get summary of trades by exit reason"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -534,7 +717,7 @@ class PaperTradingDB:
     
     def to_dataframe(self, status: Optional[str] = None) -> pd.DataFrame:
         """Export all trades to pandas DataFrame"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             if status:
                 query = "SELECT * FROM paper_trades WHERE status = ?"
                 df = pd.read_sql_query(query, conn, params=(status,))
@@ -550,7 +733,7 @@ class PaperTradingDB:
     
     def delete_trade(self, trade_id: str) -> bool:
         """Delete a trade by ID"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM paper_trades WHERE id = ?", (trade_id,))
             conn.commit()
@@ -558,7 +741,7 @@ class PaperTradingDB:
     
     def clear_all_trades(self) -> int:
         """Clear all trades (use with caution!)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM paper_trades")
             conn.commit()
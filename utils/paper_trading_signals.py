@@ -13,6 +13,7 @@ from utils.take_profit_calculator import calculate_take_profit, calculate_stop_l
 from models.edge_estimator import EnsembleEdgeEstimator
 from strategies.adaptive_kelly import AdaptiveKelly
 from scanner import PolymarketScanner, Market
+from operator import itemgetter
 
 
 class PaperTradingSignalGenerator:
@@ -232,7 +233,7 @@ class PaperTradingSignalGenerator:
                     scored_markets.append((signal['edge'], 999, market.end_date, market, signal))
         
         # Sort by score descending (highest priority first)
-        scored_markets.sort(reverse=True, key=lambda x: x[0])
+        scored_markets.sort(reverse=True, key=itemgetter(0))
         print(f"Scored {len(scored_markets)} opportunities by resolution time + edge")
         
         # Generate signals in priority order
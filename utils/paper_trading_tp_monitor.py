@@ -13,6 +13,8 @@ import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
 try:
     import schedule
     HAS_SCHEDULE = True
@@ -331,18 +333,25 @@ class TPSLMonitor:
         # Get holding time stats
         holding_stats = self.db.get_avg_holding_time()
         
-        # Get all closed trades with exit reasons
+        # Get all closed trades with exit reasons - pnl and reason go
+        # into arrays once, then the breakdown is boolean-mask reductions
+        # instead of five filtered passes over the dicts
         closed = self.db.get_closed_trades()
-        tp_trades = [t for t in closed if t.get('exit_reason') == 'tp']
-        sl_trades = [t for t in closed if t.get('exit_reason') == 'stop_loss']
-        
+        n = len(closed)
+        pnl = np.fromiter(
+            (t.get('pnl') or 0 for t in closed), dtype=np.float64, count=n
+        )
+        reasons = np.array([t.get('exit_reason') or '' for t in closed])
+        tp_mask = reasons == 'tp'
+        sl_mask = reasons == 'stop_loss'
+
         return {
-            'total_closed': len(closed),
-            'tp_exits': len(tp_trades),
-            'sl_exits': len(sl_trades),
-            'resolution_exits': len([t for t in closed if t.get('exit_reason') == 'resolution']),
-            'tp_pnl': sum(t.get('pnl', 0) for t in tp_trades),
-            'sl_pnl': sum(t.get('pnl', 0) for t in sl_trades),
+            'total_closed': n,
+            'tp_exits': int(tp_mask.sum()),
+            'sl_exits': int(sl_mask.sum()),
+            'resolution_exits': int((reasons == 'resolution').sum()),
+            'tp_pnl': float(pnl[tp_mask].sum()),
+            'sl_pnl': float(pnl[sl_mask].sum()),
             'avg_holding_days': holding_stats.get('avg_holding_days'),
             'checks_performed': self.check_count,
             'last_check': self.last_check_time.isoformat() if self.last_check_time else None
@@ -4,6 +4,7 @@ Updates paper trades with market outcomes and calculates P&L
 Timestamp: 2026-02-03 20:30 GMT+1
 """
 
+from collections import Counter, defaultdict
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -199,41 +200,44 @@ class PaperTradingUpdater:
         closed_trades = self.db.get_closed_trades()
         open_trades = self.db.get_open_trades()
         
-        # Calculate by side
-        yes_trades = [t for t in closed_trades if t['intended_side'] == 'YES']
-        no_trades = [t for t in closed_trades if t['intended_side'] == 'NO']
-        
-        yes_wins = sum(1 for t in yes_trades if t.get('pnl', 0) > 0)
-        no_wins = sum(1 for t in no_trades if t.get('pnl', 0) > 0)
-        
-        # Calculate by exit reason
-        tp_trades = [t for t in closed_trades if t.get('exit_reason') == 'tp']
-        sl_trades = [t for t in closed_trades if t.get('exit_reason') == 'stop_loss']
-        resolution_trades = [t for t in closed_trades if t.get('exit_reason') == 'resolution']
-        
-        tp_wins = sum(1 for t in tp_trades if t.get('pnl', 0) > 0)
-        sl_wins = sum(1 for t in sl_trades if t.get('pnl', 0) > 0)
-        res_wins = sum(1 for t in resolution_trades if t.get('pnl', 0) > 0)
-        
+        # Bucket by side and exit reason in one pass - the old filtered
+        # sub-lists walked closed_trades nine times for these counts
+        side_counts = Counter()
+        side_wins = Counter()
+        reason_counts = Counter()
+        reason_wins = Counter()
+        reason_pnl = defaultdict(float)
+
+        for t in closed_trades:
+            side = t['intended_side']
+            reason = t.get('exit_reason')
+            pnl = t.get('pnl', 0)
+            won = pnl > 0
+            side_counts[side] += 1
+            side_wins[side] += won
+            reason_counts[reason] += 1
+            reason_wins[reason] += won
+            reason_pnl[reason] += pnl
+
         # Get holding time stats
         holding_stats = self.db.get_avg_holding_time()
-        
+
         return {
             **summary,
-            'yes_win_rate': yes_wins / len(yes_trades) if yes_trades else 0,
-            'no_win_rate': no_wins / len(no_trades) if no_trades else 0,
+            'yes_win_rate': side_wins['YES'] / side_counts['YES'] if side_counts['YES'] else 0,
+            'no_win_rate': side_wins['NO'] / side_counts['NO'] if side_counts['NO'] else 0,
             'open_trades_count': len(open_trades),
             'closed_trades_count': len(closed_trades),
             # TP/SL stats
-            'tp_exits': len(tp_trades),
-            'sl_exits': len(sl_trades),
-            'resolution_exits': len(resolution_trades),
-            'tp_win_rate': tp_wins / len(tp_trades) if tp_trades else 0,
-            'sl_win_rate': sl_wins / len(sl_trades) if sl_trades else 0,
-            'resolution_win_rate': res_wins / len(resolution_trades) if resolution_trades else 0,
-            'tp_pnl': sum(t.get('pnl', 0) for t in tp_trades),
-            'sl_pnl': sum(t.get('pnl', 0) for t in sl_trades),
-            'resolution_pnl': sum(t.get('pnl', 0) for t in resolution_trades),
+            'tp_exits': reason_counts['tp'],
+            'sl_exits': reason_counts['stop_loss'],
+            'resolution_exits': reason_counts['resolution'],
+            'tp_win_rate': reason_wins['tp'] / reason_counts['tp'] if reason_counts['tp'] else 0,
+            'sl_win_rate': reason_wins['stop_loss'] / reason_counts['stop_loss'] if reason_counts['stop_loss'] else 0,
+            'resolution_win_rate': reason_wins['resolution'] / reason_counts['resolution'] if reason_counts['resolution'] else 0,
+            'tp_pnl': reason_pnl['tp'],
+            'sl_pnl': reason_pnl['stop_loss'],
+            'resolution_pnl': reason_pnl['resolution'],
             # Holding stats
             'avg_holding_days': holding_stats.get('avg_holding_days'),
         }
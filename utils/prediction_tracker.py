@@ -135,6 +135,38 @@ class PredictionTracker:
         
         return None
     
+    @property
+    def calibration_version(self) -> str:
+        """
+        Cheap version tag for the current set of resolved outcomes.
+
+        Changes whenever a new outcome is recorded, so callers can use
+        it as a memoization key that auto-invalidates.
+        """
+        resolved = [p for p in self.predictions if p.resolved]
+        latest = max((p.timestamp for p in resolved), default='')
+        return f"{len(resolved)}:{latest}"
+
+    @property
+    def has_sufficient_data(self) -> bool:
+        """Whether any predictions have resolved yet"""
+        return any(p.resolved for p in self.predictions)
+
+    @property
+    def current_kelly_fraction(self) -> float:
+        """
+        Recommended Kelly fraction from current calibration.
+
+        Hot-path alternative to get_calibration_report() - computes just
+        the Brier-based recommendation without building the full report
+        dict.
+        """
+        brier_scores = [
+            p.brier_score for p in self.predictions
+            if p.resolved and p.brier_score is not None
+        ]
+        return self._recommend_kelly(brier_scores)
+
     def get_calibration_report(self) -> Dict:
         """
         Analyze prediction accuracy and return comprehensive report.
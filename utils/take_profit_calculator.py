@@ -6,6 +6,7 @@ Formula: Take-Profit % = (Initial Edge × 0.5) / Entry Price
 """
 
 import numpy as np
+from functools import lru_cache
 from typing import Optional
 from dataclasses import dataclass
 
@@ -35,6 +36,7 @@ class StopLossLevel:
     side: str                    # 'YES' or 'NO'
 
 
+@lru_cache(maxsize=8192)
 def calculate_take_profit(
     entry_price: float,
     estimated_prob: float,
@@ -209,6 +211,7 @@ def calculate_holding_days(
     return max(0, days)
 
 
+@lru_cache(maxsize=8192)
 def calculate_stop_loss(
     entry_price: float,
     side: str,